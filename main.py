@@ -7,8 +7,17 @@ This script demonstrates the basic usage of the system:
 3. Load and process documents
 4. Create vector store
 5. Run queries
+
+Pass --profile to profile the query loop with cProfile (and py-spy, if
+installed); see docs/perf.md.
 """
 
+import cProfile
+import os
+import pstats
+import shutil
+import signal
+import subprocess
 import sys
 from pathlib import Path
 
@@ -17,10 +26,10 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.config import load_config
 from src.loaders import DocumentLoader
-from src.splitters import get_text_splitter, split_documents
+from src.splitters import get_text_splitter, split_documents, split_documents_parent_child
 from src.embeddings import get_embeddings
 from src.vectorstore import create_vectorstore_from_docs, get_vectorstore
-from src.chains import get_retrieval_chain
+from src.chains import get_retrieval_chain, get_llm, ResponseCache, SemanticCache, StreamingAnswerHandler
 from src.utils import setup_logging, validate_config, ensure_directories, format_retrieval_response
 
 
@@ -53,21 +62,44 @@ def main():
     embeddings_config = config.get_embeddings_config()
     embeddings_provider = embeddings_config.get("provider", "openai")
     
-    logger.info(f"Initializing embeddings provider: {embeddings_provider}")
+    logger.info("Initializing embeddings provider: %s", embeddings_provider)
     
     # Get provider-specific config
+    embedding_kwargs = {}
     if embeddings_provider == "openai":
-        model = embeddings_config.get("openai", {}).get("model")
-    elif embeddings_provider == "huggingface":
-        model = embeddings_config.get("huggingface", {}).get("model_name")
+        openai_config = embeddings_config.get("openai", {})
+        model = openai_config.get("model")
+        for key in ("max_concurrency", "max_tokens_per_request"):
+            if key in openai_config:
+                embedding_kwargs[key] = openai_config[key]
+    elif embeddings_provider == "ollama":
+        provider_config = dict(embeddings_config.get("ollama", {}))
+        model = provider_config.pop("model", None)
+        embedding_kwargs.update(provider_config)
+    elif embeddings_provider in ("huggingface", "infinity"):
+        provider_config = dict(embeddings_config.get(embeddings_provider, {}))
+        model = provider_config.pop("model_name", None)
+        embedding_kwargs.update(provider_config)
+    elif embeddings_provider == "onnx":
+        onnx_config = embeddings_config.get("onnx", {})
+        model = onnx_config.get("model_name")
+        for key in ("model_dir", "quantize", "quantization_target"):
+            if key in onnx_config:
+                embedding_kwargs[key] = onnx_config[key]
     else:
         model = None
     
     try:
-        embeddings = get_embeddings(provider=embeddings_provider, model=model)
+        embeddings = get_embeddings(
+            provider=embeddings_provider,
+            model=model,
+            cache_dir=embeddings_config.get("cache_dir") or None,
+            query_cache_size=embeddings_config.get("query_cache_size", 1024),
+            **embedding_kwargs
+        )
         logger.info("Embeddings initialized successfully")
     except Exception as e:
-        logger.error(f"Failed to initialize embeddings: {e}")
+        logger.error("Failed to initialize embeddings: %s", e)
         print(f"Error: {e}")
         print("\nPlease ensure you have set the required API keys:")
         print("  - For OpenAI: export OPENAI_API_KEY='your-key'")
@@ -105,25 +137,52 @@ def main():
     )
     
     try:
-        documents = loader.load_directory(str(documents_path))
-        print(f"Loaded {len(documents)} document chunks")
-        logger.info(f"Loaded {len(documents)} documents from {documents_path}")
+        # Documents are loaded lazily while they are being split, so the
+        # raw documents of the whole corpus are never held at once
+        documents = loader.iter_directory(
+            str(documents_path),
+            max_workers=doc_processing_config.get("max_workers"),
+            strict=doc_processing_config.get("strict", False)
+        )
     except Exception as e:
-        logger.error(f"Failed to load documents: {e}")
+        logger.error("Failed to load documents: %s", e)
         print(f"Error loading documents: {e}")
         return 1
     
     # Split documents
     print("Splitting documents into chunks...")
     splitter_config = doc_processing_config.get("splitter", {})
-    split_docs = split_documents(
-        documents,
-        chunk_size=splitter_config.get("chunk_size", 1000),
-        chunk_overlap=splitter_config.get("chunk_overlap", 200),
-        separators=splitter_config.get("separators")
-    )
+    parent_documents = None
+    try:
+        # Files are parsed during splitting, so load errors surface here
+        if splitter_config.get("strategy", "standard") == "parent_child":
+            split_docs, parent_documents = split_documents_parent_child(
+                documents,
+                parent_chunk_size=splitter_config.get("parent_chunk_size", 1000),
+                child_chunk_size=splitter_config.get("child_chunk_size", 250),
+                child_chunk_overlap=splitter_config.get("child_chunk_overlap", 0),
+                separators=splitter_config.get("separators"),
+                length_unit=splitter_config.get("length_unit", "characters"),
+                is_separator_regex=splitter_config.get("is_separator_regex"),
+                max_workers=splitter_config.get("max_workers")
+            )
+            print(f"Created {len(parent_documents)} parent chunks")
+        else:
+            split_docs = split_documents(
+                documents,
+                chunk_size=splitter_config.get("chunk_size", 1000),
+                chunk_overlap=splitter_config.get("chunk_overlap", 200),
+                separators=splitter_config.get("separators"),
+                length_unit=splitter_config.get("length_unit", "characters"),
+                is_separator_regex=splitter_config.get("is_separator_regex"),
+                max_workers=splitter_config.get("max_workers")
+            )
+    except Exception as e:
+        logger.error("Failed to process documents: %s", e)
+        print(f"Error processing documents: {e}")
+        return 1
     print(f"Created {len(split_docs)} text chunks")
-    logger.info(f"Split into {len(split_docs)} chunks")
+    logger.info("Split into %d chunks", len(split_docs))
     
     # Create or load vector store
     vectorstore_config = config.get_vectorstore_config()
@@ -131,9 +190,17 @@ def main():
     
     print(f"\nInitializing {vectorstore_provider} vector store...")
     
-    if vectorstore_provider == "faiss":
-        index_path = vectorstore_config.get("faiss", {}).get("index_path", "data/vectorstore/faiss_index")
+    if vectorstore_provider in ("faiss", "flat"):
+        # Provider section (index_path and index options) is passed through
+        vectorstore_kwargs = dict(vectorstore_config.get(vectorstore_provider, {}))
+        for key in ("embedding_batch_size", "matrix_cache_dir"):
+            if key in vectorstore_config:
+                vectorstore_kwargs.setdefault(key, vectorstore_config[key])
+        index_path = vectorstore_kwargs.setdefault(
+            "index_path", f"data/vectorstore/{vectorstore_provider}_index"
+        )
         index_path_obj = Path(index_path)
+        index_rebuilt = False
         
         # Check if index already exists
         if index_path_obj.exists():
@@ -142,18 +209,20 @@ def main():
                 vectorstore = get_vectorstore(
                     provider=vectorstore_provider,
                     embeddings=embeddings,
-                    index_path=index_path
+                    **vectorstore_kwargs
                 )
                 logger.info("Loaded existing vector store")
             except Exception as e:
-                logger.warning(f"Failed to load existing index: {e}")
+                logger.warning("Failed to load existing index: %s", e)
                 print(f"Creating new index...")
                 vectorstore = create_vectorstore_from_docs(
                     split_docs,
                     embeddings,
                     provider=vectorstore_provider,
-                    index_path=index_path
+                    deduplicate=vectorstore_config.get("deduplicate", True),
+                    **vectorstore_kwargs
                 )
+                index_rebuilt = True
                 logger.info("Created new vector store")
         else:
             print(f"Creating new index at {index_path}")
@@ -161,8 +230,10 @@ def main():
                 split_docs,
                 embeddings,
                 provider=vectorstore_provider,
-                index_path=index_path
+                deduplicate=vectorstore_config.get("deduplicate", True),
+                **vectorstore_kwargs
             )
+            index_rebuilt = True
             logger.info("Created new vector store")
     else:
         print(f"Provider {vectorstore_provider} not yet fully implemented")
@@ -175,12 +246,75 @@ def main():
     retrieval_config = config.get_retrieval_config()
     chain_type = retrieval_config.get("chain_type", "retrieval_qa")
     
+    cache_config = retrieval_config.get("cache", {})
+    response_cache = None
+    semantic_cache = None
+    if cache_config.get("enabled", False):
+        cache_directory = cache_config.get("directory") or None
+        response_cache = ResponseCache(
+            directory=cache_directory,
+            ttl=cache_config.get("ttl"),
+        )
+        logger.info("Response cache enabled")
+        
+        semantic_config = cache_config.get("semantic", {})
+        if semantic_config.get("enabled", False):
+            semantic_cache = SemanticCache(
+                embeddings,
+                threshold=semantic_config.get("threshold", 0.95),
+                directory=cache_directory,
+                ttl=cache_config.get("ttl"),
+            )
+            logger.info("Semantic response cache enabled")
+        
+        # Answers cached before a rebuild may cite chunks that changed
+        if index_rebuilt:
+            response_cache.clear()
+            if semantic_cache is not None:
+                semantic_cache.clear()
+            logger.info("Cleared response cache after rebuilding the index")
+    
+    llm_config = retrieval_config.get("llm", {})
+    llm_provider = llm_config.get("provider", "openai")
+    
+    stream_handler = None
+    if llm_config.get("streaming", False):
+        stream_handler = StreamingAnswerHandler()
+    
+    # Local providers take their model and options from their own section
+    if llm_provider == "openai":
+        llm_model = llm_config.get("model")
+        llm_kwargs = {
+            key: llm_config[key]
+            for key in ("prompt_cache_key", "request_timeout", "max_retries")
+            if key in llm_config
+        }
+    else:
+        llm_kwargs = dict(llm_config.get(llm_provider, {}))
+        llm_model = llm_kwargs.pop("model", None)
+    
+    llm = get_llm(
+        provider=llm_provider,
+        model=llm_model,
+        temperature=llm_config.get("temperature", 0.0),
+        max_tokens=llm_config.get("max_tokens", 500),
+        streaming=stream_handler is not None,
+        callbacks=[stream_handler] if stream_handler is not None else None,
+        **llm_kwargs
+    )
+    logger.info("Initialized %s LLM", llm_provider)
+    
     chain = get_retrieval_chain(
         vectorstore=vectorstore,
         chain_type=chain_type,
-        # LLM will be created with defaults if not specified
+        llm=llm,
+        response_cache=response_cache,
+        semantic_cache=semantic_cache,
+        parent_documents=parent_documents,
+        stream_handler=stream_handler,
+        dedup_threshold=retrieval_config.get("dedup_threshold"),
     )
-    logger.info(f"Created {chain_type} chain")
+    logger.info("Created %s chain", chain_type)
     
     # Interactive query loop
     print("\n" + "="*70)
@@ -189,6 +323,14 @@ def main():
     print("Type your questions below (or 'quit' to exit)")
     print()
     
+    profiler = None
+    flamegraph_process = None
+    reports_path = Path(paths_config.get("reports", "data/reports"))
+    if "--profile" in sys.argv:
+        profiler = cProfile.Profile()
+        flamegraph_process = _start_flamegraph(reports_path / "flame.svg")
+        print("Profiling enabled; results are written on exit\n")
+    
     while True:
         try:
             question = input("Question: ").strip()
@@ -200,25 +342,96 @@ def main():
                 continue
             
             print("\nProcessing...")
-            response = chain({"query": question})
-            
             print("\n" + "-"*70)
-            formatted_response = format_retrieval_response(response)
+            
+            # Only time spent answering is profiled, not waiting for input
+            if profiler is not None:
+                profiler.enable()
+            
+            if stream_handler is None:
+                response = chain({"query": question})
+                formatted_response = format_retrieval_response(response)
+            else:
+                # Answer tokens are printed by the handler as they arrive
+                print("Answer:")
+                stream_handler.streamed = False
+                response = chain({"query": question})
+                if not stream_handler.streamed:
+                    # Cached answers are not streamed
+                    print(response.get("result", ""), end="")
+                print("\n")
+                formatted_response = format_retrieval_response(response, include_answer=False)
+            
+            if profiler is not None:
+                profiler.disable()
+            
             print(formatted_response)
             print("-"*70 + "\n")
             
-            logger.info(f"Answered question: {question[:50]}...")
+            logger.info("Answered question: %.50s...", question)
             
         except KeyboardInterrupt:
             print("\n\nExiting...")
             break
         except Exception as e:
-            logger.error(f"Error processing question: {e}")
+            logger.error("Error processing question: %s", e)
             print(f"\nError: {e}\n")
     
+    if semantic_cache is not None:
+        semantic_cache.flush()
+    
+    if profiler is not None:
+        profiler.disable()
+        _write_profile(profiler, reports_path / "profile.pstats")
+    if flamegraph_process is not None:
+        # py-spy writes the flamegraph when interrupted
+        flamegraph_process.send_signal(signal.SIGINT)
+        flamegraph_process.wait()
+        print(f"Flamegraph written to {reports_path / 'flame.svg'}")
+    
     logger.info("NIS-2 Compliance Expert System shutting down")
     return 0
 
 
+def _start_flamegraph(output_path: Path):
+    """
+    Start py-spy sampling this process, if py-spy is installed.
+    
+    Args:
+        output_path: Path of the flamegraph SVG to write
+        
+    Returns:
+        py-spy process, or None if py-spy is not available
+    """
+    if shutil.which("py-spy") is None:
+        print("py-spy not found; skipping flamegraph (pip install py-spy)")
+        return None
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    return subprocess.Popen(
+        ["py-spy", "record", "-o", str(output_path), "--pid", str(os.getpid())],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _write_profile(profiler: cProfile.Profile, output_path: Path) -> None:
+    """
+    Print the top functions by cumulative time and save the raw profile.
+    
+    Args:
+        profiler: Profiler that recorded the query loop
+        output_path: Path to write the pstats file to
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(output_path))
+    
+    print("\n" + "="*70)
+    print("Profile (top 30 by cumulative time)")
+    print("="*70)
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(30)
+    print(f"Profile written to {output_path}")
+
+
 if __name__ == "__main__":
     sys.exit(main())
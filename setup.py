@@ -12,12 +12,13 @@ long_description = readme_file.read_text(encoding="utf-8") if readme_file.exists
 # Read requirements
 requirements_file = Path(__file__).parent / "requirements.txt"
 if requirements_file.exists():
-    with open(requirements_file, "r", encoding="utf-8") as f:
-        requirements = [
-            line.strip() 
-            for line in f 
-            if line.strip() and not line.startswith("#")
-        ]
+    # Parse as bytes and decode only the kept lines; indented comment lines
+    # are skipped as well
+    requirements = [
+        stripped.decode("utf-8")
+        for line in requirements_file.read_bytes().splitlines()
+        if (stripped := line.strip()) and not stripped.startswith(b"#")
+    ]
 else:
     requirements = []
 
@@ -1,5 +1,46 @@
-"""LangChain chains for NIS-2 compliance queries and analysis."""
+"""LangChain chains for NIS-2 compliance queries and analysis.
 
-from .retrieval_chain import get_retrieval_chain
+Public names are resolved on first access (PEP 562), so importing the
+package does not pull in LangChain's chain and OpenAI modules until a
+chain is actually built.
+"""
 
-__all__ = ["get_retrieval_chain"]
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .retrieval_chain import get_retrieval_chain, get_llm, answer_questions, aanswer_questions
+    from .response_cache import ResponseCache, SemanticCache
+    from .streaming import StreamingAnswerHandler
+
+_LAZY_ATTRIBUTES = {
+    "get_retrieval_chain": ".retrieval_chain",
+    "get_llm": ".retrieval_chain",
+    "answer_questions": ".retrieval_chain",
+    "aanswer_questions": ".retrieval_chain",
+    "ResponseCache": ".response_cache",
+    "SemanticCache": ".response_cache",
+    "StreamingAnswerHandler": ".streaming",
+}
+
+__all__ = [
+    "get_retrieval_chain",
+    "get_llm",
+    "answer_questions",
+    "aanswer_questions",
+    "ResponseCache",
+    "SemanticCache",
+    "StreamingAnswerHandler",
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,395 @@
+"""
+Response caching for NIS-2 retrieval chains.
+Answers repeated questions without re-running retrieval and the LLM.
+"""
+
+import atexit
+import hashlib
+import json
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+
+class ResponseCache:
+    """
+    Exact-match key/value cache for chain responses.
+
+    Responses are kept in memory by default. When a directory is given they
+    are persisted with diskcache so cached answers survive restarts. With a
+    TTL, entries expire that many seconds after they were stored.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        Initialize response cache.
+
+        Args:
+            directory: Directory for a persistent cache. If None, the cache
+                       is kept in memory for the lifetime of the process.
+            ttl: Lifetime of an entry in seconds. If None, entries never expire.
+        """
+        self.ttl = ttl
+
+        if directory is None:
+            self._store = {}
+        else:
+            try:
+                import diskcache
+            except ImportError as e:
+                raise ImportError(
+                    "diskcache is required for a persistent response cache. "
+                    "Install it with: pip install diskcache"
+                ) from e
+            self._store = diskcache.Cache(directory)
+
+        self.directory = directory
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Build a cache key from its components.
+
+        Args:
+            *parts: Key components (fingerprint, query, ...)
+
+        Returns:
+            Hex-encoded SHA-256 digest of the joined components
+        """
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        if isinstance(self._store, dict):
+            entry = self._store.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._store[key]
+                return None
+            return response
+
+        return self._store.get(key)
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key
+            response: Response dictionary to cache
+        """
+        if isinstance(self._store, dict):
+            expires_at = time.time() + self.ttl if self.ttl is not None else None
+            self._store[key] = (expires_at, response)
+        else:
+            self._store.set(key, response, expire=self.ttl)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._store.clear()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+class SemanticCache:
+    """
+    Similarity-based cache for paraphrased questions.
+
+    Question embeddings are L2-normalized and kept in a FAISS inner-product
+    index, so a lookup is one embedding call plus a flat scan over previously
+    answered questions. A cached response is returned when the cosine
+    similarity to a stored question exceeds the threshold.
+
+    New entries are written to disk by flush(), not on every add, so the
+    index is serialized once per session instead of once per question.
+    flush() is registered to run at interpreter exit. With a TTL, entries
+    older than that many seconds are ignored by lookups.
+
+    FAISS is imported by the methods that use it, so importing this module
+    (e.g. for ResponseCache alone) does not load its native library.
+    """
+
+    INDEX_FILE = "semantic_cache.faiss"
+    ENTRIES_FILE = "semantic_cache.pkl"
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        threshold: float = 0.95,
+        directory: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            embeddings: Embeddings instance used to embed questions
+            threshold: Minimum cosine similarity for a cache hit
+            directory: Directory to persist the index in. If None, the cache
+                       is kept in memory for the lifetime of the process.
+            ttl: Lifetime of an entry in seconds. If None, entries never expire.
+        """
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl = ttl
+        self.directory = Path(directory) if directory else None
+
+        self._index = None
+        self._entries: List[tuple] = []
+        self._dirty = False
+
+        if self.directory:
+            if (self.directory / self.INDEX_FILE).exists():
+                self._load()
+            atexit.register(self.flush)
+
+    def embed(self, question: str) -> np.ndarray:
+        """
+        Embed and L2-normalize a question.
+
+        Args:
+            question: Question text
+
+        Returns:
+            Normalized float32 vector of shape (1, d)
+        """
+        import faiss
+
+        vector = np.asarray([self.embeddings.embed_query(question)], dtype=np.float32)
+        faiss.normalize_L2(vector)
+        return vector
+
+    def lookup(self, vector: np.ndarray, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached response for a similar question.
+
+        Args:
+            vector: Normalized question embedding from embed()
+            fingerprint: Chain fingerprint the response must have been produced with
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        if self._index is None or self._index.ntotal == 0:
+            return None
+
+        k = min(4, self._index.ntotal)
+        scores, positions = self._index.search(vector, k)
+        oldest = time.time() - self.ttl if self.ttl is not None else None
+
+        for score, position in zip(scores[0], positions[0]):
+            if score < self.threshold:
+                break
+            entry_fingerprint, response, created_at = self._entries[position]
+            if entry_fingerprint == fingerprint and (oldest is None or created_at >= oldest):
+                return response
+
+        return None
+
+    def add(self, vector: np.ndarray, fingerprint: str, response: Dict[str, Any]) -> None:
+        """
+        Add an answered question to the cache.
+
+        Args:
+            vector: Normalized question embedding from embed()
+            fingerprint: Chain fingerprint the response was produced with
+            response: Response dictionary to cache
+        """
+        import faiss
+
+        if self._index is None:
+            self._index = faiss.IndexFlatIP(vector.shape[1])
+
+        self._index.add(vector)
+        self._entries.append((fingerprint, response, time.time()))
+        self._dirty = True
+
+    def clear(self) -> None:
+        """Remove all cached entries, including persisted ones."""
+        self._index = None
+        self._entries = []
+        self._dirty = False
+
+        if self.directory:
+            for name in (self.INDEX_FILE, self.ENTRIES_FILE):
+                (self.directory / name).unlink(missing_ok=True)
+
+    def flush(self) -> None:
+        """Persist entries added since the last flush to the cache directory."""
+        if not self._dirty or not self.directory:
+            return
+
+        self._save()
+        self._dirty = False
+
+    def _save(self) -> None:
+        """Persist the index and cached responses to the cache directory."""
+        import faiss
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(self._index, str(self.directory / self.INDEX_FILE))
+        with open(self.directory / self.ENTRIES_FILE, "wb") as f:
+            pickle.dump(self._entries, f)
+
+    def _load(self) -> None:
+        """Load a previously persisted index and cached responses."""
+        import faiss
+
+        self._index = faiss.read_index(str(self.directory / self.INDEX_FILE))
+        with open(self.directory / self.ENTRIES_FILE, "rb") as f:
+            entries = pickle.load(f)
+
+        # Entries written before TTL support lack a creation time
+        now = time.time()
+        self._entries = [entry if len(entry) == 3 else (*entry, now) for entry in entries]
+
+
+class CachedChain:
+    """
+    Wrapper that answers repeated chain inputs from a ResponseCache.
+
+    The cache key combines a fingerprint of the chain configuration (LLM
+    model, temperature, prompt template, retrieval settings) with the
+    chain inputs, so changing any of them never returns a stale answer.
+    With a SemanticCache, paraphrases of earlier questions are answered
+    from cache as well. Chains sampling with a temperature above zero are
+    not cached, since their answers are not meant to repeat. Attributes
+    not defined here are delegated to the wrapped chain.
+    """
+
+    def __init__(
+        self,
+        chain: Any,
+        cache: ResponseCache,
+        semantic_cache: Optional[SemanticCache] = None,
+    ):
+        """
+        Initialize cached chain.
+
+        Args:
+            chain: Chain to wrap (e.g. RetrievalQA)
+            cache: Response cache for exact matches
+            semantic_cache: Optional cache for similar questions
+        """
+        self.chain = chain
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+        self.fingerprint = chain_fingerprint(chain)
+        self.enabled = not getattr(_chain_llm(chain), "temperature", None)
+
+    def __call__(self, inputs: Any, *args, **kwargs) -> Dict[str, Any]:
+        """Run the chain, returning a cached response when available."""
+        return self._cached(inputs, lambda: self.chain(inputs, *args, **kwargs))
+
+    def invoke(self, inputs: Any, *args, **kwargs) -> Dict[str, Any]:
+        """Invoke the chain, returning a cached response when available."""
+        return self._cached(inputs, lambda: self.chain.invoke(inputs, *args, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.chain, name)
+
+    def _cached(self, inputs: Any, compute) -> Dict[str, Any]:
+        """
+        Return the cached response for inputs, computing and storing it on a miss.
+
+        Args:
+            inputs: Chain inputs (dict or single string)
+            compute: Callable producing the response on a cache miss
+
+        Returns:
+            Response dictionary
+        """
+        if not self.enabled:
+            return compute()
+
+        key = ResponseCache.make_key(
+            self.fingerprint,
+            json.dumps(inputs, sort_keys=True, default=str),
+        )
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        question = self._semantic_question(inputs)
+        vector = None
+        if question is not None:
+            vector = self.semantic_cache.embed(question)
+            cached = self.semantic_cache.lookup(vector, self.fingerprint)
+            if cached is not None:
+                return {**cached, **inputs}
+
+        response = compute()
+        self.cache.set(key, response)
+        if vector is not None:
+            self.semantic_cache.add(vector, self.fingerprint, response)
+        return response
+
+    def _semantic_question(self, inputs: Any) -> Optional[str]:
+        """
+        Get the question to use for semantic lookup, if applicable.
+
+        Conversational inputs with chat history are excluded because the
+        answer depends on the conversation, not just the question.
+        """
+        if self.semantic_cache is None or not isinstance(inputs, dict):
+            return None
+        if inputs.get("chat_history"):
+            return None
+        return inputs.get("query") or inputs.get("question")
+
+
+def chain_fingerprint(chain: Any) -> str:
+    """
+    Fingerprint the configuration of a retrieval chain.
+
+    Args:
+        chain: RetrievalQA or ConversationalRetrievalChain instance
+
+    Returns:
+        Hex-encoded SHA-256 digest of the LLM, prompt and retriever settings
+    """
+    llm_chain = _chain_llm_chain(chain)
+    llm = getattr(llm_chain, "llm", None)
+    prompt = getattr(llm_chain, "prompt", None)
+    retriever = getattr(chain, "retriever", None)
+
+    parts = [
+        type(chain).__name__,
+        type(retriever).__name__,
+        str(getattr(retriever, "threshold", None)),
+        str(getattr(llm, "model_name", None) or getattr(llm, "model", None)),
+        str(getattr(llm, "temperature", None)),
+        str(getattr(llm, "max_tokens", None)),
+        str(getattr(prompt, "template", None) or prompt),
+        json.dumps(getattr(retriever, "search_kwargs", None), sort_keys=True, default=str),
+    ]
+    return ResponseCache.make_key(*parts)
+
+
+def _chain_llm_chain(chain: Any) -> Any:
+    """Get the LLMChain that generates the answer of a retrieval chain."""
+    combine_chain = getattr(chain, "combine_documents_chain", None) or getattr(
+        chain, "combine_docs_chain", None
+    )
+    return getattr(combine_chain, "llm_chain", None)
+
+
+def _chain_llm(chain: Any) -> Any:
+    """Get the LLM that generates the answer of a retrieval chain."""
+    return getattr(_chain_llm_chain(chain), "llm", None)
@@ -0,0 +1,167 @@
+"""
+Retrievers for NIS-2 compliance queries.
+Post-process retrieved chunks before they are stuffed into the prompt.
+"""
+
+import logging
+from typing import Dict, List
+
+from langchain.callbacks.manager import CallbackManagerForRetrieverRun
+from langchain.schema import BaseRetriever, Document
+
+logger = logging.getLogger("nis2expert")
+
+
+class PostProcessingRetriever(BaseRetriever):
+    """
+    Base class for retrievers transforming the results of another retriever.
+
+    Subclasses implement process_documents(), which is also used by the
+    batched answer path to post-process documents retrieved in bulk.
+    """
+
+    child_retriever: BaseRetriever
+
+    @property
+    def search_kwargs(self) -> dict:
+        """Search arguments of the wrapped retriever."""
+        return getattr(self.child_retriever, "search_kwargs", {})
+
+    def process_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Transform documents returned by the wrapped retriever.
+
+        Args:
+            documents: Retrieved documents, best match first
+
+        Returns:
+            Transformed documents
+        """
+        raise NotImplementedError
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        documents = self.child_retriever.get_relevant_documents(
+            query, callbacks=run_manager.get_child()
+        )
+        return self.process_documents(documents)
+
+
+class ParentContextRetriever(PostProcessingRetriever):
+    """
+    Retriever returning parent chunks for matching child chunks.
+
+    The wrapped retriever searches the small child chunks produced by
+    split_documents_parent_child(). Matches are replaced by their parent
+    chunk, keeping the order of the best-ranked child and returning each
+    parent only once. Children without a known parent are returned as-is.
+    """
+
+    parents: Dict[str, Document]
+
+    def process_documents(self, documents: List[Document]) -> List[Document]:
+        """Replace child chunks by their parent chunks."""
+        return expand_to_parents(documents, self.parents)
+
+
+class DeduplicatingRetriever(PostProcessingRetriever):
+    """
+    Retriever dropping near-duplicate chunks.
+
+    Documents are compared by the Jaccard similarity of their word 5-gram
+    shingles. Going down the ranking, a document is kept only if its
+    similarity to every document kept so far is below the threshold, so
+    overlapping chunks do not repeat the same text in the prompt.
+    """
+
+    threshold: float = 0.7
+
+    def process_documents(self, documents: List[Document]) -> List[Document]:
+        """Drop documents that near-duplicate a higher-ranked document."""
+        kept = deduplicate_documents(documents, self.threshold)
+
+        if len(kept) < len(documents) and logger.isEnabledFor(logging.DEBUG):
+            saved = sum(len(doc.page_content) for doc in documents) - sum(
+                len(doc.page_content) for doc in kept
+            )
+            logger.debug(
+                "Dropped %d near-duplicate chunks (%d characters of context)",
+                len(documents) - len(kept),
+                saved,
+            )
+
+        return kept
+
+
+def expand_to_parents(children: List[Document], parents: Dict[str, Document]) -> List[Document]:
+    """
+    Replace child chunks by their parent chunks.
+
+    Args:
+        children: Retrieved child chunks, best match first
+        parents: Mapping of parent ID to parent chunk
+
+    Returns:
+        Deduplicated parent chunks in order of their best-ranked child
+    """
+    seen = set()
+    documents = []
+
+    for child in children:
+        parent_id = child.metadata.get("parent_id")
+        parent = parents.get(parent_id)
+
+        if parent is None:
+            documents.append(child)
+        elif parent_id not in seen:
+            seen.add(parent_id)
+            documents.append(parent)
+
+    return documents
+
+
+def deduplicate_documents(
+    documents: List[Document],
+    threshold: float = 0.7,
+    shingle_size: int = 5,
+) -> List[Document]:
+    """
+    Greedily drop documents similar to an already kept document.
+
+    Args:
+        documents: Documents ordered by relevance, best match first
+        threshold: Jaccard similarity at or above which a document is dropped
+        shingle_size: Number of words per shingle
+
+    Returns:
+        Kept documents in their original order
+    """
+    kept = []
+    kept_shingles = []
+
+    for doc in documents:
+        shingles = _shingles(doc.page_content, shingle_size)
+        if all(_jaccard(shingles, other) < threshold for other in kept_shingles):
+            kept.append(doc)
+            kept_shingles.append(shingles)
+
+    return kept
+
+
+def _shingles(text: str, size: int) -> frozenset:
+    """Build the set of lowercased word n-grams of a text."""
+    words = text.lower().split()
+    if len(words) <= size:
+        return frozenset([tuple(words)])
+    return frozenset(tuple(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of two sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
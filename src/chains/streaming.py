@@ -0,0 +1,28 @@
+"""
+Streaming output for NIS-2 retrieval chains.
+Prints answer tokens as the LLM generates them.
+"""
+
+from typing import Any
+
+from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+
+
+class StreamingAnswerHandler(StreamingStdOutCallbackHandler):
+    """
+    Callback handler writing LLM tokens to stdout as they arrive.
+
+    The ``streamed`` flag records whether any token was written since it
+    was last reset, so callers can tell a streamed answer from one served
+    without an LLM call (e.g. from the response cache) and print the
+    latter themselves.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.streamed = False
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        """Write a new token to stdout."""
+        self.streamed = True
+        super().on_llm_new_token(token, **kwargs)
@@ -3,11 +3,20 @@ Configuration loader for NIS-2 Expert System.
 Handles loading and validation of configuration from YAML file.
 """
 
+import copy
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import yaml
 
+# The libyaml-based loader parses several times faster; it is missing when
+# PyYAML was built without libyaml
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+ENV_PREFIX = "NIS2_"
+
 
 class Config:
     """Configuration class for NIS-2 Expert System."""
@@ -20,6 +29,9 @@ class Config:
             config_dict: Dictionary containing configuration values
         """
         self._config = config_dict
+        # Every key path, including those of nested sections, mapped to its
+        # value so lookups are a single dict access
+        self._flat = dict(_flatten(config_dict))
         
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -32,18 +44,7 @@ class Config:
         Returns:
             Configuration value
         """
-        keys = key.split('.')
-        value = self._config
-        
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-                if value is None:
-                    return default
-            else:
-                return default
-                
-        return value
+        return self._flat.get(key, default)
     
     def get_embeddings_config(self) -> Dict[str, Any]:
         """Get embeddings configuration."""
@@ -70,6 +71,29 @@ class Config:
         return self._config.get('logging', {})
 
 
+def _flatten(config_dict: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (dot-separated key path, value) pairs of a nested dictionary.
+    
+    Sections are yielded as well as their leaves. Keys with a None value
+    are skipped, so lookups of them fall back to the default.
+    
+    Args:
+        config_dict: Nested configuration dictionary
+        prefix: Key path of config_dict itself
+        
+    Yields:
+        Interned key path and value
+    """
+    for key, value in config_dict.items():
+        if value is None:
+            continue
+        path = sys.intern(f"{prefix}{key}")
+        yield path, value
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{path}.")
+
+
 def load_config(config_path: Optional[str] = None) -> Config:
     """
     Load configuration from YAML file.
@@ -91,11 +115,13 @@ def load_config(config_path: Optional[str] = None) -> Config:
     
     config_path = Path(config_path)
     
-    if not config_path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}") from None
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config_dict = yaml.safe_load(f)
+    # The parsed file is shared between calls, so overrides go to a copy
+    config_dict = copy.deepcopy(_parse_config(str(config_path), mtime_ns))
     
     # Load environment variable overrides
     _apply_env_overrides(config_dict)
@@ -103,29 +129,103 @@ def load_config(config_path: Optional[str] = None) -> Config:
     return Config(config_dict)
 
 
+@lru_cache(maxsize=8)
+def _parse_config(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse a YAML configuration file.
+    
+    Results are cached by path and modification time, so repeated loads
+    skip the parse while edits to the file are picked up.
+    
+    Args:
+        path: Path to the configuration file
+        mtime_ns: Modification time of the file in nanoseconds
+        
+    Returns:
+        Parsed configuration dictionary (shared; do not modify)
+    """
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+@lru_cache(maxsize=None)
+def _env_key_path(env_key: str) -> List[str]:
+    """Split a NIS2_ environment variable name into a config key path."""
+    return env_key[len(ENV_PREFIX):].lower().split('_')
+
+
 def _apply_env_overrides(config_dict: Dict[str, Any]) -> None:
     """
     Apply environment variable overrides to configuration.
     
     Environment variables should be prefixed with NIS2_ and use underscores
-    for nested keys (e.g., NIS2_EMBEDDINGS_PROVIDER).
+    for nested keys (e.g., NIS2_EMBEDDINGS_PROVIDER). A value is converted to
+    the type of the setting it overrides, so NIS2_RETRIEVAL_K=8 sets the
+    integer 8; string settings and keys missing from config.yaml keep the
+    raw string, so a model version like "3.10" is not turned into a float.
     
     Args:
         config_dict: Configuration dictionary to update
     """
-    env_prefix = "NIS2_"
+    overrides = [
+        (env_key, env_value)
+        for env_key, env_value in os.environ.items()
+        if env_key.startswith(ENV_PREFIX)
+    ]
+    if not overrides:
+        return
+    
+    for env_key, env_value in overrides:
+        key_path = _env_key_path(env_key)
+        
+        # Navigate to the right place in config dict
+        current = config_dict
+        for key in key_path[:-1]:
+            if key not in current:
+                current[key] = {}
+            current = current[key]
+        
+        # Set the value
+        name = key_path[-1]
+        current[name] = _parse_env_value(env_key, env_value, current.get(name))
+
+
+def _parse_env_value(env_key: str, value: str, current_value: Any) -> Any:
+    """
+    Convert an environment variable value to the type of the setting it overrides.
     
-    for env_key, env_value in os.environ.items():
-        if env_key.startswith(env_prefix):
-            # Remove prefix and convert to lowercase
-            key_path = env_key[len(env_prefix):].lower().split('_')
-            
-            # Navigate to the right place in config dict
-            current = config_dict
-            for key in key_path[:-1]:
-                if key not in current:
-                    current[key] = {}
-                current = current[key]
-            
-            # Set the value
-            current[key_path[-1]] = env_value
+    Args:
+        env_key: Name of the environment variable, used in error messages
+        value: Raw environment variable value
+        current_value: Value the key has in config.yaml, None if unset
+        
+    Returns:
+        The value converted to type(current_value), or the unchanged string
+        when the existing value is a string or missing
+        
+    Raises:
+        ValueError: If the value cannot be converted to the existing type
+    """
+    if current_value is None or isinstance(current_value, str):
+        return value
+    
+    expected = type(current_value)
+    # bool("false") is True, and lists are written in YAML flow syntax, so
+    # both go through the YAML loader; numbers use the type's own parser
+    if expected in (int, float):
+        try:
+            return expected(value)
+        except ValueError:
+            pass
+    else:
+        try:
+            parsed = yaml.load(value, Loader=_YAML_LOADER)
+        except yaml.YAMLError:
+            parsed = None
+        if isinstance(parsed, expected):
+            return parsed
+    
+    raise ValueError(
+        f"{env_key}={value!r} cannot be converted to {expected.__name__}, "
+        f"the type of the setting it overrides"
+    )
@@ -0,0 +1,141 @@
+"""
+Batched embeddings wrapper for API-backed embedding providers.
+Packs texts into token-capped sub-batches and embeds them concurrently.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import tiktoken
+from langchain.embeddings.base import Embeddings
+from openai import RateLimitError
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+
+class BatchedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that batches and parallelizes document embedding.
+
+    Texts are packed greedily into sub-batches that stay below a token
+    budget per API request. Sub-batches are embedded concurrently and the
+    resulting vectors are returned in the original input order. Requests
+    that hit the provider's rate limit are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: Optional[str] = None,
+        max_concurrency: int = 8,
+        max_tokens_per_request: int = 250_000,
+    ):
+        """
+        Initialize batched embeddings.
+
+        Args:
+            embeddings: Underlying embeddings instance (e.g. OpenAIEmbeddings)
+            model: Model name used to select the tokenizer for batch packing
+            max_concurrency: Maximum number of sub-batches embedded in parallel
+            max_tokens_per_request: Token budget for a single sub-batch
+        """
+        self.embeddings = embeddings
+        self.model = model or getattr(embeddings, "model", None)
+        self.max_concurrency = max_concurrency
+        self.max_tokens_per_request = max_tokens_per_request
+        self._encoding = None
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of documents using concurrent, token-capped sub-batches.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors in the same order as ``texts``
+        """
+        if not texts:
+            return []
+
+        batches = self._batch_texts(texts, self.max_tokens_per_request)
+
+        if len(batches) == 1 or self.max_concurrency <= 1:
+            results = [self._embed_batch(batch) for batch in batches]
+        else:
+            max_workers = min(self.max_concurrency, len(batches))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map() yields results in submission order
+                results = list(executor.map(self._embed_batch, batches))
+
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query text.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        return self.embeddings.embed_query(text)
+
+    def _batch_texts(self, texts: List[str], max_tokens: int) -> List[List[str]]:
+        """
+        Greedily pack texts into sub-batches below a token budget.
+
+        A single text exceeding the budget is placed in its own sub-batch;
+        the underlying provider is responsible for truncating or chunking it.
+
+        Args:
+            texts: Texts to pack
+            max_tokens: Maximum number of tokens per sub-batch
+
+        Returns:
+            List of sub-batches preserving the input order
+        """
+        token_counts = [
+            len(tokens) for tokens in self._get_encoding().encode_ordinary_batch(texts)
+        ]
+
+        batches = []
+        current_batch = []
+        current_tokens = 0
+
+        for text, n_tokens in zip(texts, token_counts):
+            if current_batch and current_tokens + n_tokens > max_tokens:
+                batches.append(current_batch)
+                current_batch = []
+                current_tokens = 0
+            current_batch.append(text)
+            current_tokens += n_tokens
+
+        if current_batch:
+            batches.append(current_batch)
+
+        return batches
+
+    @retry(
+        retry=retry_if_exception_type(RateLimitError),
+        wait=wait_exponential(multiplier=1, min=1, max=60),
+        stop=stop_after_attempt(6),
+        reraise=True,
+    )
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """Embed one sub-batch, retrying on rate-limit (HTTP 429) errors."""
+        return self.embeddings.embed_documents(batch)
+
+    def _get_encoding(self):
+        """Get (and cache) the tiktoken encoding for the configured model."""
+        if self._encoding is None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(self.model or "")
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+        return self._encoding
@@ -0,0 +1,226 @@
+"""
+Embedding caches for document chunks and queries.
+Avoids re-embedding unchanged chunks when vector stores are rebuilt and
+repeated questions within a session.
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that caches document vectors on disk and query
+    vectors in memory.
+
+    Each chunk is keyed by ``sha256(namespace | text)``, where the namespace
+    identifies the provider and model. Switching models therefore never
+    returns stale vectors, and only chunks not seen before are sent to the
+    underlying embeddings.
+
+    Query vectors are memoized per instance in an LRU cache, so asking the
+    same question again within a session costs no embedding call. Each
+    instance wraps a single model, so the query cache never mixes models.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache_dir: Optional[str],
+        namespace: str,
+        query_cache_size: int = 1024,
+    ):
+        """
+        Initialize cached embeddings.
+
+        Args:
+            embeddings: Underlying embeddings instance
+            cache_dir: Directory of the on-disk document cache. If None,
+                       document embeddings are not cached.
+            namespace: Provider/model identifier included in every key
+            query_cache_size: Maximum number of query vectors kept in memory
+                              (0 disables the query cache)
+        """
+        self.embeddings = embeddings
+        self.namespace = namespace
+        self.cache_dir = cache_dir
+        self._store = None
+
+        if cache_dir is not None:
+            try:
+                import diskcache
+            except ImportError as e:
+                raise ImportError(
+                    "diskcache is required for the embedding cache. "
+                    "Install it with: pip install diskcache"
+                ) from e
+            self._store = diskcache.Cache(cache_dir)
+
+        self._embed_query_cached = lru_cache(maxsize=query_cache_size)(self._embed_query)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents, reusing cached vectors where available.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors in the same order as ``texts``
+        """
+        if self._store is None:
+            return self.embeddings.embed_documents(texts)
+
+        keys = [self._key(text) for text in texts]
+        vectors = [self._store.get(key) for key in keys]
+
+        # Embed each distinct missing text once, even if it occurs repeatedly
+        missing = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(keys[i], texts[i])
+
+        if missing:
+            new_vectors = self.embeddings.embed_documents(list(missing.values()))
+            for key, vector in zip(missing, new_vectors):
+                self._store[key] = np.asarray(vector, dtype=np.float32).tobytes()
+            computed = dict(zip(missing, new_vectors))
+        else:
+            computed = {}
+
+        return [
+            computed[key] if vector is None else np.frombuffer(vector, dtype=np.float32).tolist()
+            for key, vector in zip(keys, vectors)
+        ]
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query text, reusing the vector of an identical query.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        return list(self._embed_query_cached(text))
+
+    def _embed_query(self, text: str) -> Tuple[float, ...]:
+        """Embed a query as an immutable tuple for the LRU cache."""
+        return tuple(self.embeddings.embed_query(text))
+
+    def _key(self, text: str) -> str:
+        """Build the cache key for a text."""
+        return hashlib.sha256(f"{self.namespace}|{text}".encode("utf-8")).hexdigest()
+
+
+def embedding_namespace(embeddings: Embeddings) -> str:
+    """
+    Identify the provider, model and precision of an embeddings instance.
+    
+    Args:
+        embeddings: Embeddings instance
+        
+    Returns:
+        CachedEmbeddings namespace, or class, model name and precision
+        otherwise
+    """
+    namespace = getattr(embeddings, "namespace", None)
+    if namespace:
+        return namespace
+    
+    model_id = getattr(embeddings, "model", None) or getattr(embeddings, "model_name", None)
+    namespace = f"{type(embeddings).__name__}|{model_id}"
+    precision = model_precision(embeddings)
+    return f"{namespace}|{precision}" if precision else namespace
+
+
+def model_precision(embeddings: Embeddings) -> Optional[str]:
+    """
+    Describe the weight precision of a local model, if it is not fp32.
+    
+    Quantized and half-precision builds of a model produce slightly
+    different vectors, so they must not share cached embeddings with the
+    fp32 build.
+    
+    Args:
+        embeddings: Embeddings instance
+        
+    Returns:
+        "int8-<target>" for quantized ONNX models, "fp16" for half-precision
+        torch models, None otherwise
+    """
+    if getattr(embeddings, "quantization_target", None) is not None:
+        return f"int8-{embeddings.quantization_target}" if embeddings.quantize else None
+    
+    parameters = getattr(getattr(embeddings, "client", None), "parameters", None)
+    if callable(parameters):
+        first = next(iter(parameters()), None)
+        if first is not None and str(getattr(first, "dtype", "")) == "torch.float16":
+            return "fp16"
+    
+    return None
+
+
+def load_or_compute(
+    texts: List[str],
+    namespace: str,
+    cache_dir: str,
+    compute: Callable[[], np.ndarray],
+) -> np.ndarray:
+    """
+    Load the embedding matrix of a corpus from disk, computing it on a miss.
+    
+    The matrix is stored as ``<cache_dir>/<namespace hash>-<key>.npy``,
+    where the key hashes the namespace and every text in order. An
+    unchanged corpus (same documents, splitter settings and model) is
+    therefore loaded with a single read instead of one lookup per chunk,
+    and any change produces a new key. Only the latest matrix per namespace
+    is kept: saving a new one deletes its predecessors, since the
+    per-chunk vectors stay in the CachedEmbeddings store anyway.
+    
+    Args:
+        texts: Texts of all chunks, in index order
+        namespace: Provider/model identifier (see embedding_namespace)
+        cache_dir: Directory of the matrix files
+        compute: Callable returning the float32 matrix on a cache miss
+        
+    Returns:
+        Embedding matrix of shape (len(texts), d)
+    """
+    prefix = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:16]
+    digest = hashlib.sha256(namespace.encode("utf-8"))
+    for text in texts:
+        encoded = text.encode("utf-8")
+        # Length-prefix each text so different splits never hash alike
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    
+    path = Path(cache_dir) / f"{prefix}-{digest.hexdigest()}.npy"
+    
+    if path.exists():
+        vectors = np.load(path)
+        if vectors.shape[0] == len(texts):
+            return vectors
+    
+    vectors = compute()
+    
+    # Write to a temporary file first so an interrupted save is never loaded
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp_path, vectors)
+    os.replace(tmp_path, path)
+    
+    # Drop older matrices of the same model; temporary files of concurrent
+    # writers are left alone
+    for old_path in path.parent.glob(f"{prefix}-*.npy"):
+        if old_path != path and not old_path.name.endswith(".tmp.npy"):
+            old_path.unlink(missing_ok=True)
+    
+    return vectors
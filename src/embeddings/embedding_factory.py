@@ -1,28 +1,54 @@
 """
 Embedding factory for creating embedding models.
-Supports OpenAI and HuggingFace embeddings with easy switching.
+Supports OpenAI, HuggingFace, Infinity, Ollama and local ONNX embeddings
+with easy switching.
 """
 
+import logging
 import os
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 from langchain.embeddings import OpenAIEmbeddings, HuggingFaceEmbeddings
 from langchain.embeddings.base import Embeddings
 
+from .batched_embeddings import BatchedEmbeddings
+from .embedding_cache import CachedEmbeddings, model_precision
+
+logger = logging.getLogger("nis2expert")
+
+# Models created in this process, keyed by provider, model and arguments.
+# Loading a sentence-transformer or ONNX session takes seconds and hundreds
+# of MB, and each OpenAI client holds its own pool of TLS connections, so
+# repeated factory calls share one instance.
+_SHARED_MODELS: Dict[str, Embeddings] = {}
+
+# Arguments of the huggingface provider passed on to ONNXEmbeddings when
+# quantization is "int8"
+ONNX_OPTIONS = ("model_dir", "max_length", "quantization_target")
+
 
 def get_embeddings(
     provider: str = "openai",
     model: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    query_cache_size: int = 1024,
     **kwargs
 ) -> Embeddings:
     """
     Create an embedding model based on provider.
     
     This factory function allows easy switching between different
-    embedding providers through configuration.
+    embedding providers through configuration. Provider models are shared
+    by all calls with the same arguments, so callers must not modify the
+    returned instance (or the model it wraps).
     
     Args:
-        provider: Embedding provider ("openai" or "huggingface")
+        provider: Embedding provider ("openai", "huggingface", "infinity",
+                  "ollama" or "onnx")
         model: Model name/identifier (provider-specific)
+        cache_dir: Directory for caching document embeddings on disk.
+                   If None, document embeddings are not cached.
+        query_cache_size: Number of query embeddings memoized in memory
+                          (0 disables the query cache)
         **kwargs: Additional provider-specific arguments
         
     Returns:
@@ -33,69 +59,310 @@ def get_embeddings(
         
     Environment Variables:
         OPENAI_API_KEY: Required for OpenAI embeddings
-        HF_TOKEN: Optional for HuggingFace private models
+        HF_TOKEN: Optional for HuggingFace and Infinity private models
     """
     provider = provider.lower()
     
     if provider == "openai":
-        return _get_openai_embeddings(model, **kwargs)
+        embeddings = _get_openai_embeddings(model, **kwargs)
     elif provider == "huggingface":
-        return _get_huggingface_embeddings(model, **kwargs)
+        embeddings = _get_huggingface_embeddings(model, **kwargs)
+    elif provider == "infinity":
+        embeddings = _get_infinity_embeddings(model, **kwargs)
+    elif provider == "ollama":
+        embeddings = _get_ollama_embeddings(model, **kwargs)
+    elif provider == "onnx":
+        embeddings = _get_onnx_embeddings(model, **kwargs)
     else:
         raise ValueError(
             f"Unsupported embedding provider: {provider}. "
-            f"Supported providers: openai, huggingface"
+            f"Supported providers: openai, huggingface, infinity, ollama, onnx"
+        )
+    
+    if cache_dir or query_cache_size:
+        # fp16 and int8 builds of a model must not reuse fp32 vectors
+        model_id = getattr(embeddings, "model", None) or getattr(embeddings, "model_name", None)
+        namespace = f"{provider}|{model_id}"
+        precision = model_precision(embeddings)
+        if precision:
+            namespace = f"{namespace}|{precision}"
+        embeddings = CachedEmbeddings(
+            embeddings,
+            cache_dir=cache_dir or None,
+            namespace=namespace,
+            query_cache_size=query_cache_size,
         )
+    
+    return embeddings
 
 
-def _get_openai_embeddings(model: Optional[str] = None, **kwargs) -> OpenAIEmbeddings:
+def _get_openai_embeddings(
+    model: Optional[str] = None,
+    max_concurrency: int = 8,
+    max_tokens_per_request: int = 250_000,
+    **kwargs
+) -> Embeddings:
     """
     Create OpenAI embeddings.
     
+    Document embedding is wrapped in BatchedEmbeddings so large corpora are
+    sent as token-capped sub-batches issued concurrently. The client is
+    created once per process and arguments, so its HTTP connections stay
+    open across factory calls.
+    
     Args:
         model: OpenAI embedding model name
+        max_concurrency: Maximum number of embedding requests in flight
+        max_tokens_per_request: Token budget per embedding request
         **kwargs: Additional arguments for OpenAIEmbeddings
         
     Returns:
-        OpenAIEmbeddings instance
+        BatchedEmbeddings wrapping an OpenAIEmbeddings instance
     """
     if model is None:
         model = "text-embedding-ada-002"
     
-    # Check for API key
-    if not os.getenv("OPENAI_API_KEY"):
-        print("Warning: OPENAI_API_KEY not set in environment variables")
+    def _create() -> OpenAIEmbeddings:
+        # Checked when the shared client is created, not on every call
+        if not kwargs.get("openai_api_key") and not os.getenv("OPENAI_API_KEY"):
+            print("Warning: OPENAI_API_KEY not set in environment variables")
+        return OpenAIEmbeddings(model=model, **kwargs)
+    
+    embeddings = _get_shared_model("openai", model, kwargs, _create)
     
-    return OpenAIEmbeddings(
+    return BatchedEmbeddings(
+        embeddings,
         model=model,
-        **kwargs
+        max_concurrency=max_concurrency,
+        max_tokens_per_request=max_tokens_per_request,
     )
 
 
 def _get_huggingface_embeddings(
     model: Optional[str] = None,
+    batch_size: int = 64,
+    quantization: str = "fp32",
     **kwargs
-) -> HuggingFaceEmbeddings:
+) -> Embeddings:
     """
     Create HuggingFace embeddings.
     
+    Texts are encoded in batches of batch_size on the GPU when one is
+    available. Mean pooling and L2 normalization run on the same device,
+    and on a GPU the result is copied to the host once per call. The model is
+    loaded once per process and arguments; later calls return the same
+    instance.
+    
+    Quantization trades a little accuracy for speed and memory: "fp16"
+    halves the weights on the GPU, and "int8" runs the model with ONNX
+    Runtime using dynamically quantized int8 weights on the CPU (see the
+    onnx provider).
+    
     Args:
         model: HuggingFace model identifier
-        **kwargs: Additional arguments for HuggingFaceEmbeddings
+        batch_size: Number of texts encoded per forward pass
+        quantization: Weight precision ("fp32", "fp16" or "int8")
+        **kwargs: Additional arguments for HuggingFaceEmbeddings, or for
+                  "int8" the ONNXEmbeddings options in ONNX_OPTIONS
         
     Returns:
-        HuggingFaceEmbeddings instance
+        HuggingFaceEmbeddings instance, or ONNXEmbeddings for "int8"
+        
+    Raises:
+        ValueError: If quantization is not supported, or for "int8" if
+                    arguments other than ONNX_OPTIONS are given
     """
     if model is None:
         # Default to a lightweight, effective model
         model = "sentence-transformers/all-MiniLM-L6-v2"
     
-    return HuggingFaceEmbeddings(
-        model_name=model,
-        **kwargs
+    quantization = quantization.lower()
+    
+    if quantization == "int8":
+        onnx_kwargs = {key: kwargs.pop(key) for key in ONNX_OPTIONS if key in kwargs}
+        if kwargs:
+            raise ValueError(
+                f"Unsupported arguments for int8 embeddings: {', '.join(sorted(kwargs))}. "
+                f"Supported arguments: {', '.join(ONNX_OPTIONS)}"
+            )
+        return _get_onnx_embeddings(model, quantize=True, batch_size=batch_size, **onnx_kwargs)
+    elif quantization not in ("fp32", "fp16"):
+        raise ValueError(
+            f"Unsupported quantization: {quantization}. "
+            f"Supported values: fp32, fp16, int8"
+        )
+    
+    encode_kwargs = dict(kwargs.pop("encode_kwargs", None) or {})
+    encode_kwargs.setdefault("batch_size", batch_size)
+    encode_kwargs.setdefault("normalize_embeddings", True)
+    kwargs["encode_kwargs"] = encode_kwargs
+    
+    model_kwargs = dict(kwargs.pop("model_kwargs", None) or {})
+    if "device" not in model_kwargs:
+        import torch
+        
+        model_kwargs["device"] = "cuda" if torch.cuda.is_available() else "cpu"
+    kwargs["model_kwargs"] = model_kwargs
+    
+    on_gpu = str(model_kwargs["device"]).startswith("cuda")
+    if on_gpu:
+        # Keep the pooled, normalized vectors of all batches on the GPU and
+        # copy them to the host once, instead of synchronizing per batch
+        encode_kwargs.setdefault("convert_to_tensor", True)
+    
+    if quantization == "fp16" and not on_gpu:
+        # Half precision is emulated on most CPUs and slower than fp32
+        logger.warning("fp16 embeddings require a CUDA device; using fp32")
+        quantization = "fp32"
+    
+    def _load() -> HuggingFaceEmbeddings:
+        embeddings = HuggingFaceEmbeddings(model_name=model, **kwargs)
+        if quantization == "fp16":
+            embeddings.client.half()
+        return embeddings
+    
+    return _get_shared_model(
+        "huggingface",
+        model,
+        {**kwargs, "quantization": quantization},
+        _load,
+    )
+
+
+def _get_infinity_embeddings(
+    model: Optional[str] = None,
+    **kwargs
+) -> Embeddings:
+    """
+    Create local embeddings served by the Infinity engine.
+    
+    Infinity batches concurrent requests dynamically and uses optimized
+    attention kernels, giving several times the throughput of plain
+    sentence-transformers. The engine is started once per process and
+    arguments.
+    
+    Args:
+        model: HuggingFace model identifier
+        **kwargs: Additional arguments for InfinityEmbeddings
+                  (engine, dtype, device, batch_size)
+        
+    Returns:
+        InfinityEmbeddings instance
+    """
+    from .infinity_embeddings import InfinityEmbeddings
+    
+    if model is None:
+        model = "sentence-transformers/all-MiniLM-L6-v2"
+    
+    return _get_shared_model(
+        "infinity",
+        model,
+        kwargs,
+        lambda: InfinityEmbeddings(model_name=model, **kwargs),
     )
 
 
+def _get_ollama_embeddings(
+    model: Optional[str] = None,
+    base_url: Optional[str] = None,
+    batch_size: int = 64,
+    **kwargs
+) -> Embeddings:
+    """
+    Create embeddings served by a local Ollama instance.
+    
+    Chunks are sent in batches to Ollama's /api/embed endpoint, falling
+    back to one /api/embeddings request per text on older servers.
+    
+    Args:
+        model: Ollama embedding model name
+        base_url: URL of the Ollama server. Defaults to OLLAMA_HOST or
+                  http://localhost:11434.
+        batch_size: Number of texts sent per request
+        **kwargs: Additional arguments for OllamaEmbeddings (timeout)
+        
+    Returns:
+        OllamaEmbeddings instance
+    """
+    from .ollama_embeddings import OllamaEmbeddings
+    
+    if model is None:
+        model = "nomic-embed-text"
+    
+    if base_url is None:
+        base_url = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+    
+    kwargs.update(base_url=base_url, batch_size=batch_size)
+    
+    # Shared so the HTTP session keeps its connection to the server open
+    return _get_shared_model(
+        "ollama",
+        model,
+        kwargs,
+        lambda: OllamaEmbeddings(model=model, **kwargs),
+    )
+
+
+def _get_onnx_embeddings(
+    model: Optional[str] = None,
+    **kwargs
+) -> Embeddings:
+    """
+    Create local ONNX Runtime embeddings.
+    
+    The model is exported to ONNX (and quantized to int8 by default) on
+    first use, so queries are embedded locally in milliseconds without
+    API calls or rate limits. As with HuggingFace embeddings, the session
+    is loaded once per process and arguments.
+    
+    Args:
+        model: HuggingFace sentence-transformer model identifier
+        **kwargs: Additional arguments for ONNXEmbeddings
+        
+    Returns:
+        ONNXEmbeddings instance
+    """
+    from .onnx_embeddings import ONNXEmbeddings
+    
+    if model is None:
+        model = "sentence-transformers/all-MiniLM-L6-v2"
+    
+    return _get_shared_model(
+        "onnx",
+        model,
+        kwargs,
+        lambda: ONNXEmbeddings(model_name=model, **kwargs),
+    )
+
+
+def _get_shared_model(
+    provider: str,
+    model: str,
+    kwargs: Dict[str, Any],
+    factory: Callable[[], Embeddings],
+) -> Embeddings:
+    """
+    Return the shared model for the given arguments, creating it once.
+    
+    Args:
+        provider: Embedding provider
+        model: Model identifier
+        kwargs: Arguments the model is created with
+        factory: Callable creating the model on a cache miss
+        
+    Returns:
+        Shared Embeddings instance
+    """
+    # kwargs may hold dicts (e.g. encode_kwargs), so key on their repr
+    key = f"{provider}|{model}|{sorted(kwargs.items())!r}"
+    
+    embeddings = _SHARED_MODELS.get(key)
+    if embeddings is None:
+        embeddings = _SHARED_MODELS[key] = factory()
+    
+    return embeddings
+
+
 # TODO: Add support for additional embedding providers
 # - get_cohere_embeddings(): Cohere embeddings
 # - get_vertex_ai_embeddings(): Google Vertex AI embeddings
@@ -0,0 +1,129 @@
+"""
+Local embeddings served in-process by the Infinity inference engine.
+Coalesces concurrent embedding requests into dynamically sized batches.
+"""
+
+import asyncio
+import atexit
+import threading
+from typing import List, Optional
+
+from langchain.embeddings.base import Embeddings
+
+
+class InfinityEmbeddings(Embeddings):
+    """
+    Sentence-transformer embeddings run by an Infinity AsyncEmbeddingEngine.
+
+    The engine runs on an event loop in a background thread. Requests from
+    any thread are queued on that loop, and the engine merges queued
+    sentences into batches of up to ``batch_size``, so concurrent queries
+    (e.g. batched retrieval) share forward passes instead of running one
+    by one. The engine is started once and stopped at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        engine: str = "torch",
+        dtype: str = "auto",
+        device: str = "auto",
+        batch_size: int = 64,
+    ):
+        """
+        Initialize Infinity embeddings.
+
+        Args:
+            model_name: HuggingFace model identifier (HF_TOKEN is used for
+                        private models, as with the huggingface provider)
+            engine: Infinity backend ("torch", "optimum" or "ctranslate2")
+            dtype: Weight precision ("auto", "float16", "float32", "int8", ...)
+            device: Device ("auto", "cuda" or "cpu")
+            batch_size: Maximum number of sentences per forward pass
+        """
+        try:
+            from infinity_emb import AsyncEmbeddingEngine, EngineArgs
+        except ImportError as e:
+            raise ImportError(
+                "infinity_emb is required for Infinity embeddings. "
+                "Install it with: pip install infinity-emb[torch]"
+            ) from e
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+
+        self._engine = AsyncEmbeddingEngine.from_args(
+            EngineArgs(
+                model_name_or_path=model_name,
+                engine=engine,
+                dtype=dtype,
+                device=device,
+                batch_size=batch_size,
+            )
+        )
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._run(self._engine.astart())
+        atexit.register(self.close)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of documents.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors in the same order as ``texts``
+        """
+        if not texts:
+            return []
+        return self._run(self._aembed(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query text.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        return self._run(self._aembed([text]))[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents without blocking the caller's event loop."""
+        if not texts:
+            return []
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._aembed(texts), self._loop)
+        )
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Embed a query without blocking the caller's event loop."""
+        return (await self.aembed_documents([text]))[0]
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the engine and its event loop thread.
+
+        Args:
+            timeout: Seconds to wait for the engine to stop
+        """
+        if not self._loop.is_running():
+            return
+        asyncio.run_coroutine_threadsafe(self._engine.astop(), self._loop).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+
+    async def _aembed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts on the engine loop."""
+        embeddings, _ = await self._engine.embed(sentences=texts)
+        return [vector.tolist() for vector in embeddings]
+
+    def _run(self, coroutine):
+        """Run a coroutine on the engine loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
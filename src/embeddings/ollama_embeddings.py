@@ -0,0 +1,102 @@
+"""
+Embeddings served by a local Ollama instance.
+Sends chunks in batches to the /api/embed endpoint instead of one request
+per text.
+"""
+
+from typing import List
+
+import requests
+from langchain.embeddings.base import Embeddings
+
+
+class OllamaEmbeddings(Embeddings):
+    """
+    Embeddings computed by an Ollama server.
+
+    Texts are sent in slices of ``batch_size`` to ``/api/embed``, which
+    accepts a list of inputs, so indexing a document costs one HTTP round
+    trip per batch instead of one per chunk. Ollama versions before 0.1.35
+    only provide the single-text ``/api/embeddings`` endpoint; if the batch
+    endpoint is unavailable, texts are embedded one by one through it and
+    the batch endpoint is not tried again.
+    """
+
+    def __init__(
+        self,
+        model: str = "nomic-embed-text",
+        base_url: str = "http://localhost:11434",
+        batch_size: int = 64,
+        timeout: float = 120.0,
+    ):
+        """
+        Initialize Ollama embeddings.
+
+        Args:
+            model: Name of an embedding model pulled into Ollama
+            base_url: URL of the Ollama server
+            batch_size: Number of texts sent per request
+            timeout: Seconds to wait for a response
+        """
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+        self._session = requests.Session()
+        self._batch_supported = True
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of documents.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors in the same order as ``texts``
+        """
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._embed_batch(texts[start:start + self.batch_size]))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query text.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        return self._embed_batch([text])[0]
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one batch, falling back to per-text requests if needed."""
+        if self._batch_supported:
+            response = self._session.post(
+                f"{self.base_url}/api/embed",
+                json={"model": self.model, "input": texts},
+                timeout=self.timeout,
+            )
+            # Servers without the endpoint answer 404
+            if response.status_code != 404:
+                response.raise_for_status()
+                embeddings = response.json().get("embeddings")
+                if embeddings is not None:
+                    return embeddings
+            self._batch_supported = False
+
+        return [self._embed_single(text) for text in texts]
+
+    def _embed_single(self, text: str) -> List[float]:
+        """Embed one text with the legacy /api/embeddings endpoint."""
+        response = self._session.post(
+            f"{self.base_url}/api/embeddings",
+            json={"model": self.model, "prompt": text},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()["embedding"]
@@ -0,0 +1,148 @@
+"""
+Local sentence-transformer embeddings served with ONNX Runtime.
+Runs small models such as all-MiniLM-L6-v2 on CPU without API calls.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+
+class ONNXEmbeddings(Embeddings):
+    """
+    Sentence-transformer embeddings exported to ONNX and run on CPU.
+
+    On first use the HuggingFace model is exported to ONNX and, by default,
+    dynamically quantized to int8. The exported model is saved to
+    ``model_dir`` so later runs load it directly. Token embeddings are
+    mean-pooled over the attention mask and L2-normalized, matching the
+    output of sentence-transformers.
+    """
+
+    QUANTIZED_FILE = "model_quantized.onnx"
+    MODEL_FILE = "model.onnx"
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        model_dir: Optional[str] = None,
+        quantize: bool = True,
+        batch_size: int = 64,
+        max_length: int = 256,
+        quantization_target: str = "avx2",
+    ):
+        """
+        Initialize ONNX embeddings.
+
+        Args:
+            model_name: HuggingFace sentence-transformer model identifier
+            model_dir: Directory for the exported ONNX model. Defaults to
+                       data/models/<model name>-onnx.
+            quantize: Whether to quantize the model to int8
+            batch_size: Number of texts encoded per forward pass
+            max_length: Maximum number of tokens per text
+            quantization_target: Instruction set the int8 kernels are tuned
+                                 for ("avx2", "avx512", "avx512_vnni" or
+                                 "arm64"). Only used when exporting.
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "optimum with onnxruntime is required for ONNX embeddings. "
+                "Install it with: pip install optimum[onnxruntime]"
+            ) from e
+
+        if model_dir is None:
+            model_dir = f"data/models/{model_name.split('/')[-1]}-onnx"
+
+        self.model_name = model_name
+        self.model_dir = Path(model_dir)
+        self.quantize = quantize
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.quantization_target = quantization_target
+
+        file_name = self.QUANTIZED_FILE if quantize else self.MODEL_FILE
+        if not (self.model_dir / file_name).exists():
+            self._export()
+
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            str(self.model_dir),
+            file_name=file_name,
+            provider="CPUExecutionProvider",
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of documents.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors in the same order as ``texts``
+        """
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._encode(texts[start:start + self.batch_size]).tolist())
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query text.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        return self._encode([text])[0].tolist()
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode a batch of texts into normalized, mean-pooled embeddings."""
+        inputs = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np",
+        )
+        token_embeddings = np.asarray(self.model(**inputs).last_hidden_state)
+
+        mask = inputs["attention_mask"][..., np.newaxis].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (pooled / norms).astype(np.float32)
+
+    def _export(self) -> None:
+        """Export the HuggingFace model to ONNX and optionally quantize it."""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        model = ORTModelForFeatureExtraction.from_pretrained(self.model_name, export=True)
+        model.save_pretrained(str(self.model_dir))
+        AutoTokenizer.from_pretrained(self.model_name).save_pretrained(str(self.model_dir))
+
+        if self.quantize:
+            # Dynamic quantization needs no calibration data. AVX2 kernels
+            # run on practically every x86-64 CPU; AVX-512 VNNI computes
+            # int8 dot products natively on recent Intel and AMD server CPUs.
+            config_factory = getattr(AutoQuantizationConfig, self.quantization_target, None)
+            if config_factory is None:
+                raise ValueError(
+                    f"Unsupported quantization target: {self.quantization_target}"
+                )
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=str(self.model_dir),
+                quantization_config=config_factory(is_static=False, per_channel=False),
+            )
@@ -1,5 +1,29 @@
-"""Document loaders for NIS-2 documents and related materials."""
+"""Document loaders for NIS-2 documents and related materials.
 
-from .document_loader import DocumentLoader
+Public names are resolved on first access (PEP 562); LangChain's loader
+classes are imported only when a file of their type is loaded.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .document_loader import DocumentLoader
+
+_LAZY_ATTRIBUTES = {
+    "DocumentLoader": ".document_loader",
+}
 
 __all__ = ["DocumentLoader"]
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
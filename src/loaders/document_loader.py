@@ -3,15 +3,47 @@ Document loader for NIS-2 and ENISA documents.
 Supports PDF, TXT, DOCX, and HTML formats.
 """
 
-from pathlib import Path
-from typing import List, Optional
-from langchain.document_loaders import (
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredHTMLLoader,
-    Docx2txtLoader,
-)
-from langchain.schema import Document
+import logging
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from importlib import import_module
+from importlib.util import find_spec
+from itertools import islice
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
+
+from ..utils.helpers import format_metadata
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+logger = logging.getLogger("nis2expert")
+
+# PyMuPDF (C-based MuPDF) extracts text several times faster than pypdf.
+# It is AGPL-licensed, so deployments without it fall back to pypdfium2
+# (Google's PDFium, Apache/BSD-licensed, also native code) and finally to
+# the pure-Python pypdf. All three yield one document per page with
+# "source" and "page" metadata.
+if find_spec("fitz") is not None:
+    PDF_LOADER = "PyMuPDFLoader"
+elif find_spec("pypdfium2") is not None:
+    PDF_LOADER = "PyPDFium2Loader"
+else:
+    PDF_LOADER = "PyPDFLoader"
+
+# Loader class name per file extension. LangChain's loader modules are
+# imported when a file of that type is first loaded, not at import time.
+LOADERS = {
+    'pdf': PDF_LOADER,
+    'txt': "TextLoader",
+    'html': "UnstructuredHTMLLoader",
+    'docx': "Docx2txtLoader",
+}
+
+# Formats that are cheaper to read in the calling process than to send
+# through a worker process, which pickles every document back
+INLINE_FORMATS = frozenset({'txt'})
 
 
 class DocumentLoader:
@@ -34,13 +66,14 @@ class DocumentLoader:
             supported_formats = ['pdf', 'txt', 'docx', 'html']
         
         self.supported_formats = supported_formats
+        self._format_set = frozenset(supported_formats)
         
-    def load_document(self, file_path: str) -> List[Document]:
+    def load_document(self, file_path: Union[str, os.PathLike]) -> List["Document"]:
         """
         Load a single document file.
         
         Args:
-            file_path: Path to the document file
+            file_path: Path to the document file (str or path-like)
             
         Returns:
             List of Document objects (may contain multiple pages/chunks)
@@ -49,14 +82,15 @@ class DocumentLoader:
             ValueError: If file format is not supported
             FileNotFoundError: If file does not exist
         """
-        path = Path(file_path)
+        # Plain string operations; this runs once per file during ingest
+        file_path = os.fspath(file_path)
         
-        if not path.exists():
+        if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        extension = path.suffix.lower().lstrip('.')
+        extension, _ = _loader_for_ext(os.path.splitext(file_path)[1])
         
-        if extension not in self.supported_formats:
+        if extension not in self._format_set:
             raise ValueError(
                 f"Unsupported file format: {extension}. "
                 f"Supported formats: {', '.join(self.supported_formats)}"
@@ -66,6 +100,9 @@ class DocumentLoader:
         loader = self._get_loader(file_path, extension)
         documents = loader.load()
         
+        for doc in documents:
+            doc.metadata = format_metadata(doc.metadata)
+        
         # TODO: Add metadata enrichment for NIS-2 specific documents
         # - Document type (directive, guideline, framework, etc.)
         # - Publication date
@@ -74,40 +111,135 @@ class DocumentLoader:
         
         return documents
     
-    def load_directory(self, directory_path: str, recursive: bool = True) -> List[Document]:
+    def load_directory(
+        self,
+        directory_path: str,
+        recursive: bool = True,
+        max_workers: Optional[int] = None,
+        strict: bool = False,
+    ) -> List["Document"]:
         """
         Load all documents from a directory.
         
         Args:
             directory_path: Path to directory containing documents
             recursive: Whether to search subdirectories
+            max_workers: Maximum number of worker processes (see iter_directory)
+            strict: Whether to raise on the first file that fails to load
+                    instead of logging a warning and skipping it
             
         Returns:
             List of all loaded Document objects
         """
-        dir_path = Path(directory_path)
+        return list(self.iter_directory(directory_path, recursive, max_workers, strict))
+    
+    def iter_directory(
+        self,
+        directory_path: str,
+        recursive: bool = True,
+        max_workers: Optional[int] = None,
+        strict: bool = False,
+    ) -> Iterator["Document"]:
+        """
+        Lazily load all documents from a directory.
+        
+        Files are parsed in parallel worker processes, since PDF parsing is
+        CPU-bound, and documents are yielded file by file. Only a small
+        window of files is in flight at a time, so memory stays bounded
+        by a few files rather than the whole corpus. Documents are yielded
+        in the same order as a serial load, independent of which worker
+        finishes first.
         
-        if not dir_path.exists() or not dir_path.is_dir():
+        Args:
+            directory_path: Path to directory containing documents
+            recursive: Whether to search subdirectories
+            max_workers: Maximum number of worker processes. Defaults to the
+                         number of CPUs; 1 loads files in this process.
+            strict: Whether to raise on the first file that fails to load
+                    instead of logging a warning and skipping it
+            
+        Returns:
+            Iterator over the loaded Document objects
+            
+        Raises:
+            ValueError: If the directory does not exist (raised immediately,
+                        not on first iteration)
+        """
+        directory_path = os.fspath(directory_path)
+        
+        if not os.path.isdir(directory_path):
             raise ValueError(f"Invalid directory path: {directory_path}")
         
-        all_documents = []
+        # Collect all supported files first so they can be distributed
+        file_paths = list(_iter_supported_files(directory_path, self._format_set, recursive))
         
-        # Determine search pattern
-        if recursive:
-            pattern = "**/*"
-        else:
-            pattern = "*"
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(file_paths))
         
-        # Load all supported files
-        for ext in self.supported_formats:
-            for file_path in dir_path.glob(f"{pattern}.{ext}"):
-                try:
-                    docs = self.load_document(str(file_path))
-                    all_documents.extend(docs)
-                except Exception as e:
-                    print(f"Warning: Failed to load {file_path}: {e}")
+        return self._iter_files(file_paths, max_workers, strict)
+    
+    def _iter_files(
+        self,
+        file_paths: List[str],
+        max_workers: int,
+        strict: bool = False,
+    ) -> Iterator["Document"]:
+        """
+        Load files in order, in worker processes when max_workers > 1.
         
-        return all_documents
+        Args:
+            file_paths: Paths of the files to load
+            max_workers: Number of worker processes
+            strict: Whether to raise on the first file that fails to load
+            
+        Returns:
+            Iterator over the loaded Document objects
+        """
+        if max_workers <= 1:
+            for file_path in file_paths:
+                yield from _report_errors(
+                    file_path, *_load_one(file_path, self.supported_formats), strict
+                )
+            return
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            paths = iter(file_paths)
+            
+            # Keep two files per worker in flight; results are consumed in
+            # submission order and replaced by the next file
+            pending = deque(
+                (path, self._submit(executor, path))
+                for path in islice(paths, max_workers * 2)
+            )
+            
+            while pending:
+                file_path, future = pending.popleft()
+                
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.append((next_path, self._submit(executor, next_path)))
+                
+                yield from _report_errors(file_path, *future.result(), strict)
+    
+    def _submit(self, executor: ProcessPoolExecutor, file_path: str) -> Future:
+        """
+        Schedule loading a file, reading INLINE_FORMATS files right away.
+        
+        Args:
+            executor: Worker pool for all other formats
+            file_path: Path of the file to load
+            
+        Returns:
+            Future resolving to the result of _load_one
+        """
+        extension = os.path.splitext(file_path)[1].lower().lstrip('.')
+        if extension not in INLINE_FORMATS:
+            return executor.submit(_load_one, file_path, self.supported_formats)
+        
+        future = Future()
+        future.set_result(_load_one(file_path, self.supported_formats))
+        return future
     
     def _get_loader(self, file_path: str, extension: str):
         """
@@ -120,14 +252,7 @@ class DocumentLoader:
         Returns:
             LangChain document loader instance
         """
-        loaders = {
-            'pdf': PyPDFLoader,
-            'txt': TextLoader,
-            'html': UnstructuredHTMLLoader,
-            'docx': Docx2txtLoader,
-        }
-        
-        loader_class = loaders.get(extension)
+        _, loader_class = _loader_for_ext(extension)
         if loader_class is None:
             raise ValueError(f"No loader available for extension: {extension}")
         
@@ -138,3 +263,95 @@ class DocumentLoader:
     # - categorize_by_pillar(): Categorize by NIS-2 security pillars
     # - extract_article_references(): Extract references to specific articles
     # - validate_document_structure(): Ensure document follows expected format
+
+
+def _iter_supported_files(root: str, formats: frozenset, recursive: bool = True) -> Iterator[str]:
+    """
+    Walk a directory and yield the paths of files with a supported extension.
+    
+    Uses os.scandir, whose entries carry the file type from the directory
+    listing, so no per-file stat call or Path object is needed. Entries
+    are visited in name order for a deterministic load order. Symlinked
+    files are loaded, but symlinked directories are not descended into
+    (as with pathlib's "**" glob), so link cycles cannot loop forever.
+    
+    Args:
+        root: Directory to walk
+        formats: Supported extensions (lowercase, without dot)
+        recursive: Whether to descend into subdirectories
+        
+    Returns:
+        Iterator over matching file paths
+    """
+    stack = [root]
+    
+    while stack:
+        subdirs = []
+        with os.scandir(stack.pop()) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        subdirs.append(entry.path)
+                    continue
+                
+                _, dot, extension = entry.name.rpartition('.')
+                if dot and extension.lower() in formats and entry.is_file():
+                    yield entry.path
+        
+        # Reversed so subdirectories are popped in name order
+        stack.extend(reversed(subdirs))
+
+
+@lru_cache(maxsize=16)
+def _loader_for_ext(suffix: str) -> Tuple[str, Optional[type]]:
+    """
+    Normalize a file suffix and look up its loader class.
+    
+    The loader class is imported on the first lookup of its extension and
+    cached together with the normalized extension.
+    
+    Args:
+        suffix: File suffix with or without leading dot (e.g. ".PDF")
+        
+    Returns:
+        Tuple of (lowercase extension without dot, loader class or None)
+    """
+    extension = suffix.lower().lstrip('.')
+    class_name = LOADERS.get(extension)
+    if class_name is None:
+        return extension, None
+    return extension, getattr(import_module("langchain.document_loaders"), class_name)
+
+
+def _load_one(
+    file_path: str,
+    supported_formats: List[str],
+) -> Tuple[List["Document"], Optional[Exception]]:
+    """
+    Load a single file; module-level so it can run in a worker process.
+    
+    Args:
+        file_path: Path to the document file
+        supported_formats: Supported file extensions
+        
+    Returns:
+        Tuple of (loaded documents, exception or None)
+    """
+    try:
+        return DocumentLoader(supported_formats).load_document(file_path), None
+    except Exception as e:
+        return [], e
+
+
+def _report_errors(
+    file_path: str,
+    documents: List["Document"],
+    error: Optional[Exception],
+    strict: bool = False,
+) -> List["Document"]:
+    """Log (or, if strict, raise) a failed file and pass documents through."""
+    if error is not None:
+        if strict:
+            raise error
+        logger.warning("Failed to load %s: %s", file_path, error)
+    return documents
@@ -1,5 +1,10 @@
 """Text splitters for document chunking."""
 
-from .text_splitter import get_text_splitter, split_documents
+from .text_splitter import (
+    get_text_splitter,
+    split_documents,
+    split_documents_parent_child,
+    token_length,
+)
 
-__all__ = ["get_text_splitter", "split_documents"]
+__all__ = ["get_text_splitter", "split_documents", "split_documents_parent_child", "token_length"]
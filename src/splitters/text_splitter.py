@@ -3,75 +3,194 @@ Text splitting functionality for document chunking.
 Configurable text splitter for optimal retrieval performance.
 """
 
-from typing import List, Optional
+import hashlib
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
+# Tokenizer used to measure chunk lengths in tokens (GPT-3.5/4 and
+# text-embedding-3 models all use cl100k_base)
+TOKEN_ENCODING = "cl100k_base"
+
+# Default separators as regular expressions, in order of preference. This
+# order preserves document structure: sections, paragraphs, lines, then
+# sentences and clauses before falling back to words and characters.
+# Kept separators start the following piece, so sentence and clause ends
+# are matched as lookbehinds to leave the punctuation on the left side.
+DEFAULT_SEPARATORS = [
+    r"\n{3,}",      # Blank lines between sections
+    r"\n{2}",       # Paragraph breaks
+    r"\n",          # Single newline
+    r"(?<=\. )",    # Sentence ends
+    r"(?<=, )",     # Clauses
+    r" ",           # Spaces
+    "",             # Characters (fallback)
+]
+
+# Splitting runs in worker processes only for more documents than this;
+# below it, starting the pool costs more than it saves
+PARALLEL_MIN_DOCUMENTS = 16
+
+# Documents sent to a worker process per task
+SPLIT_BATCH_SIZE = 16
+
+
+@lru_cache(maxsize=1)
+def get_token_encoder():
+    """
+    Return the tiktoken encoder shared by all splitters.
+    
+    Loading an encoding parses its BPE ranks, so it is created once per
+    process on first use and reused by every splitter afterwards.
+    
+    Returns:
+        tiktoken Encoding for TOKEN_ENCODING
+    """
+    import tiktoken
+    
+    return tiktoken.get_encoding(TOKEN_ENCODING)
+
+
+def token_length(text: str) -> int:
+    """
+    Count the tokens of a text with the shared encoder.
+    
+    Args:
+        text: Text to measure
+        
+    Returns:
+        Number of tokens
+    """
+    # encode_ordinary skips the special-token scan, which chunk text never needs
+    return len(get_token_encoder().encode_ordinary(text))
+
+
+def get_length_function(length_unit: str = "tokens") -> Callable[[str], int]:
+    """
+    Get the function measuring chunk lengths.
+    
+    Args:
+        length_unit: "tokens" or "characters"
+        
+    Returns:
+        Callable returning the length of a text in the given unit
+    """
+    if length_unit == "tokens":
+        return token_length
+    elif length_unit == "characters":
+        return len
+    else:
+        raise ValueError(f"Unsupported length unit: {length_unit}")
+
 
 def get_text_splitter(
     chunk_size: int = 1000,
     chunk_overlap: int = 200,
     separators: Optional[List[str]] = None,
+    length_unit: str = "characters",
+    is_separator_regex: Optional[bool] = None,
 ) -> RecursiveCharacterTextSplitter:
     """
     Create and configure a text splitter for document chunking.
     
     The RecursiveCharacterTextSplitter is used to split documents into
     smaller chunks while preserving semantic meaning and context.
+    Splitters hold no per-call state, so one instance is shared by all
+    calls with the same arguments.
     
     Args:
-        chunk_size: Maximum size of each chunk in characters
-        chunk_overlap: Number of overlapping characters between chunks
+        chunk_size: Maximum size of each chunk in length_unit
+        chunk_overlap: Overlap between consecutive chunks in length_unit
         separators: List of separators to use for splitting (in order of preference)
+        length_unit: "tokens" to measure chunks with the shared tiktoken
+                     encoder, or "characters"
+        is_separator_regex: Whether separators are regular expressions.
+                            Defaults to True for DEFAULT_SEPARATORS and
+                            False for custom separators.
         
     Returns:
         Configured RecursiveCharacterTextSplitter instance
     """
     if separators is None:
-        # Default separators optimized for structured documents
-        # This order preserves document structure (paragraphs, then sentences, then words)
-        separators = [
-            "\n\n",  # Double newline (paragraph breaks)
-            "\n",    # Single newline
-            " ",     # Spaces
-            "",      # Characters (fallback)
-        ]
-    
-    text_splitter = RecursiveCharacterTextSplitter(
+        separators = DEFAULT_SEPARATORS
+        if is_separator_regex is None:
+            is_separator_regex = True
+    
+    return _cached_splitter(
+        chunk_size,
+        chunk_overlap,
+        tuple(separators),
+        length_unit,
+        bool(is_separator_regex),
+    )
+
+
+@lru_cache(maxsize=16)
+def _cached_splitter(
+    chunk_size: int,
+    chunk_overlap: int,
+    separators: Tuple[str, ...],
+    length_unit: str,
+    is_separator_regex: bool,
+) -> RecursiveCharacterTextSplitter:
+    """Create the splitter for a set of hashable splitter arguments."""
+    return RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
-        separators=separators,
-        length_function=len,
+        separators=list(separators),
+        keep_separator=True,
+        is_separator_regex=is_separator_regex,
+        length_function=get_length_function(length_unit),
     )
-    
-    return text_splitter
 
 
 def split_documents(
-    documents: List[Document],
+    documents: Iterable[Document],
     chunk_size: int = 1000,
     chunk_overlap: int = 200,
     separators: Optional[List[str]] = None,
+    length_unit: str = "characters",
+    is_separator_regex: Optional[bool] = None,
+    max_workers: Optional[int] = None,
 ) -> List[Document]:
     """
-    Split a list of documents into smaller chunks.
+    Split documents into smaller chunks.
+    
+    Documents are consumed in small batches, so a lazy iterator (e.g. from
+    DocumentLoader.iter_directory) never has to be held in memory as a whole.
+    For more than PARALLEL_MIN_DOCUMENTS documents, batches are split in
+    worker processes; chunks are returned in input order either way.
     
     Args:
-        documents: List of Document objects to split
-        chunk_size: Maximum size of each chunk in characters
-        chunk_overlap: Number of overlapping characters between chunks
+        documents: Document objects to split (list or iterator)
+        chunk_size: Maximum size of each chunk in length_unit
+        chunk_overlap: Overlap between consecutive chunks in length_unit
         separators: List of separators to use for splitting
+        length_unit: "tokens" or "characters"
+        is_separator_regex: Whether separators are regular expressions
+        max_workers: Maximum number of worker processes. Defaults to the
+                     number of CPUs; 1 splits in this process.
         
     Returns:
         List of split Document objects
     """
-    text_splitter = get_text_splitter(
+    splitter_kwargs = dict(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         separators=separators,
+        length_unit=length_unit,
+        is_separator_regex=is_separator_regex,
     )
     
-    split_docs = text_splitter.split_documents(documents)
+    split_docs = []
+    for chunks in _map_batches(_split_batch, splitter_kwargs, documents, max_workers):
+        split_docs.extend(chunks)
     
     # TODO: Add NIS-2 specific chunk processing
     # - Preserve article/section references in metadata
@@ -82,6 +201,214 @@ def split_documents(
     return split_docs
 
 
+def split_documents_parent_child(
+    documents: Iterable[Document],
+    parent_chunk_size: int = 1000,
+    child_chunk_size: int = 250,
+    child_chunk_overlap: int = 0,
+    separators: Optional[List[str]] = None,
+    length_unit: str = "characters",
+    is_separator_regex: Optional[bool] = None,
+    max_workers: Optional[int] = None,
+) -> Tuple[List[Document], Dict[str, Document]]:
+    """
+    Split documents into large parent chunks and small child chunks.
+    
+    Only the child chunks are embedded and indexed; each carries the ID of
+    its parent in ``metadata["parent_id"]``. At query time the retrieved
+    children are replaced by their parents, so the LLM still sees the full
+    context while the embeddings cover short, focused spans.
+    
+    Parent IDs are derived from the source and parent text, so they stay
+    stable across runs and an existing index can be reused. Documents are
+    consumed in batches and split in worker processes, as in
+    split_documents().
+    
+    Args:
+        documents: Document objects to split (list or iterator)
+        parent_chunk_size: Maximum size of each parent chunk in length_unit
+        child_chunk_size: Maximum size of each child chunk in length_unit
+        child_chunk_overlap: Overlap between consecutive children in length_unit
+        separators: List of separators to use for splitting
+        length_unit: "tokens" or "characters"
+        is_separator_regex: Whether separators are regular expressions
+        max_workers: Maximum number of worker processes. Defaults to the
+                     number of CPUs; 1 splits in this process.
+        
+    Returns:
+        Tuple of (child chunks to index, mapping of parent ID to parent chunk)
+    """
+    splitter_kwargs = dict(
+        parent_chunk_size=parent_chunk_size,
+        child_chunk_size=child_chunk_size,
+        child_chunk_overlap=child_chunk_overlap,
+        separators=separators,
+        length_unit=length_unit,
+        is_separator_regex=is_separator_regex,
+    )
+    
+    children = []
+    parents = {}
+    
+    for batch_children, batch_parents in _map_batches(
+        _split_batch_parent_child, splitter_kwargs, documents, max_workers
+    ):
+        children.extend(batch_children)
+        parents.update(batch_parents)
+    
+    return children, parents
+
+
+def _split_batch(splitter_kwargs: Dict[str, Any], documents: List[Document]) -> List[Document]:
+    """Split a batch of documents (split_documents() worker task)."""
+    text_splitter = get_text_splitter(**splitter_kwargs)
+    
+    return [
+        chunk
+        for doc in documents
+        for chunk in _split_document(text_splitter, doc)
+    ]
+
+
+def _split_batch_parent_child(
+    splitter_kwargs: Dict[str, Any],
+    documents: List[Document],
+) -> Tuple[List[Document], Dict[str, Document]]:
+    """Split a batch of documents (split_documents_parent_child() worker task)."""
+    common = dict(
+        separators=splitter_kwargs["separators"],
+        length_unit=splitter_kwargs["length_unit"],
+        is_separator_regex=splitter_kwargs["is_separator_regex"],
+    )
+    parent_splitter = get_text_splitter(
+        chunk_size=splitter_kwargs["parent_chunk_size"],
+        chunk_overlap=0,
+        **common
+    )
+    child_splitter = get_text_splitter(
+        chunk_size=splitter_kwargs["child_chunk_size"],
+        chunk_overlap=splitter_kwargs["child_chunk_overlap"],
+        **common
+    )
+    
+    children = []
+    parents = {}
+    
+    for doc in documents:
+        for parent in _split_document(parent_splitter, doc):
+            source = str(parent.metadata.get("source", ""))
+            parent_id = hashlib.sha256(
+                f"{source}|{parent.page_content}".encode("utf-8")
+            ).hexdigest()[:32]
+            
+            parent.metadata["parent_id"] = parent_id
+            parents[parent_id] = parent
+            
+            children.extend(_split_document(child_splitter, parent))
+    
+    return children, parents
+
+
+def _map_batches(
+    function: Callable[[Dict[str, Any], List[Document]], Any],
+    splitter_kwargs: Dict[str, Any],
+    documents: Iterable[Document],
+    max_workers: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+    Apply a batch splitting function to documents, in worker processes
+    when there are enough of them.
+    
+    Splitters are rebuilt in each worker from splitter_kwargs (and cached
+    there), so only the arguments and documents are pickled. Only a small
+    window of batches is in flight at a time, as in
+    DocumentLoader.iter_directory(), and results are yielded in input order.
+    
+    Args:
+        function: Module-level function called as function(splitter_kwargs, batch)
+        splitter_kwargs: Picklable splitter arguments
+        documents: Documents to split (list or iterator)
+        max_workers: Maximum number of worker processes (None = CPUs)
+        
+    Returns:
+        Iterator over the results of function, one per batch
+    """
+    documents = iter(documents)
+    head = list(islice(documents, PARALLEL_MIN_DOCUMENTS + 1))
+    batches = _batched(chain(head, documents), SPLIT_BATCH_SIZE)
+    
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    
+    if max_workers <= 1 or len(head) <= PARALLEL_MIN_DOCUMENTS:
+        for batch in batches:
+            yield function(splitter_kwargs, batch)
+        return
+    
+    # The documents may come from DocumentLoader.iter_directory(), whose
+    # process pool (with its management thread) is still running, and
+    # forking a process with live threads can deadlock on inherited locks.
+    # Workers are therefore forked from a single-threaded fork server,
+    # which imports this module (and LangChain) once up front.
+    mp_context = None
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("forkserver")
+        mp_context.set_forkserver_preload([__name__])
+    
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+        pending = deque(
+            executor.submit(function, splitter_kwargs, batch)
+            for batch in islice(batches, max_workers * 2)
+        )
+        
+        while pending:
+            future = pending.popleft()
+            
+            next_batch = next(batches, None)
+            if next_batch is not None:
+                pending.append(executor.submit(function, splitter_kwargs, next_batch))
+            
+            yield future.result()
+
+
+def _batched(items: Iterable[Document], size: int) -> Iterator[List[Document]]:
+    """Group items into lists of at most size items."""
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _split_document(
+    text_splitter: RecursiveCharacterTextSplitter,
+    document: Document,
+) -> List[Document]:
+    """
+    Split one document, skipping the recursive splitter when it already fits.
+    
+    Most pages and parent chunks are no longer than a single chunk; for
+    those the separator search is skipped and the result is the same single
+    (whitespace-stripped) chunk the splitter would produce.
+    
+    Args:
+        text_splitter: Splitter to use for documents longer than a chunk
+        document: Document to split
+        
+    Returns:
+        List of chunks of the document
+    """
+    text = document.page_content.strip()
+    
+    if text_splitter._length_function(text) > text_splitter._chunk_size:
+        return text_splitter.split_documents([document])
+    
+    if not text:
+        return []
+    return [Document(page_content=text, metadata=dict(document.metadata))]
+
+
 # TODO: Future enhancements for NIS-2 specific splitting
 # - create_semantic_chunks(): Split based on compliance topics
 # - preserve_article_context(): Ensure article references stay intact
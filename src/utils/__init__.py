@@ -1,5 +1,19 @@
 """Utility functions for the NIS-2 Expert System."""
 
-from .helpers import setup_logging, validate_config, check_api_keys
+from .helpers import (
+    setup_logging,
+    validate_config,
+    check_api_keys,
+    ensure_directories,
+    format_retrieval_response,
+    format_metadata,
+)
 
-__all__ = ["setup_logging", "validate_config", "check_api_keys"]
+__all__ = [
+    "setup_logging",
+    "validate_config",
+    "check_api_keys",
+    "ensure_directories",
+    "format_retrieval_response",
+    "format_metadata",
+]
@@ -3,10 +3,18 @@ Utility functions for the NIS-2 Expert System.
 Includes logging setup, configuration validation, and helper functions.
 """
 
+import json
 import logging
 import os
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    # orjson serializes several times faster than the json module
+    import orjson
+except ImportError:
+    orjson = None
 
 
 def setup_logging(
@@ -17,6 +25,10 @@ def setup_logging(
     """
     Set up logging configuration for the application.
     
+    Safe to call repeatedly: the "nis2expert" logger gets at most one
+    console handler and one file handler per log file, and does not
+    propagate to the root logger, so no message is written twice.
+    
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_format: Log message format string
@@ -39,16 +51,40 @@ def setup_logging(
     
     logger = logging.getLogger("nis2expert")
     logger.setLevel(numeric_level)
+    # Handled here only; the root handler added above is for other libraries
+    logger.propagate = False
+    
+    formatter = logging.Formatter(log_format)
+    
+    # FileHandler subclasses StreamHandler, so match the exact type
+    console_handler = next(
+        (handler for handler in logger.handlers if type(handler) is logging.StreamHandler),
+        None,
+    )
+    if console_handler is None:
+        console_handler = logging.StreamHandler()
+        logger.addHandler(console_handler)
+    console_handler.setLevel(numeric_level)
+    console_handler.setFormatter(formatter)
     
     # Add file handler if log file specified
     if log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        file_handler = logging.FileHandler(log_file)
+        file_handler = next(
+            (
+                handler for handler in logger.handlers
+                if isinstance(handler, logging.FileHandler)
+                and handler.baseFilename == str(log_path.resolve())
+            ),
+            None,
+        )
+        if file_handler is None:
+            file_handler = logging.FileHandler(log_file)
+            logger.addHandler(file_handler)
         file_handler.setLevel(numeric_level)
-        file_handler.setFormatter(logging.Formatter(log_format))
-        logger.addHandler(file_handler)
+        file_handler.setFormatter(formatter)
     
     return logger
 
@@ -120,56 +156,120 @@ def get_project_root() -> Path:
     return Path(__file__).parent.parent.parent
 
 
-def format_retrieval_response(response: Dict[str, Any]) -> str:
+def format_retrieval_response(
+    response: Dict[str, Any],
+    include_answer: bool = True,
+    as_json: bool = False,
+) -> str:
     """
     Format a retrieval chain response for display.
     
     Args:
         response: Response dictionary from retrieval chain
+        include_answer: Whether to include the answer (disable when the
+                        answer was already streamed to the console)
+        as_json: Whether to return a JSON object with "answer" and
+                 "sources" (e.g. for audit logs or an API) instead of text
         
     Returns:
         Formatted string response
     """
-    output = []
+    if as_json:
+        return _format_retrieval_response_json(response, include_answer)
+    
+    sections = []
     
     # Add answer
-    if "result" in response:
-        output.append("Answer:")
-        output.append(response["result"])
-        output.append("")
-    elif "answer" in response:
-        output.append("Answer:")
-        output.append(response["answer"])
-        output.append("")
-    
-    # Add source documents if available
-    if "source_documents" in response and response["source_documents"]:
-        output.append("Sources:")
-        for i, doc in enumerate(response["source_documents"], 1):
-            source = doc.metadata.get("source", "Unknown")
-            output.append(f"{i}. {source}")
-            # Optionally add page number if available
-            if "page" in doc.metadata:
-                output[-1] += f" (Page {doc.metadata['page']})"
-        output.append("")
-    
-    return "\n".join(output)
-
-
-def check_api_keys() -> Dict[str, bool]:
+    answer = response.get("result", response.get("answer")) if include_answer else None
+    if answer is not None:
+        sections.append(f"Answer:\n{answer}\n")
+    
+    # Add source documents if available, with page numbers where known
+    source_documents = response.get("source_documents")
+    if source_documents:
+        sources = "\n".join(
+            f"{i}. {doc.metadata.get('source', 'Unknown')}"
+            + (f" (Page {doc.metadata['page']})" if "page" in doc.metadata else "")
+            for i, doc in enumerate(source_documents, 1)
+        )
+        sections.append(f"Sources:\n{sources}\n")
+    
+    return "\n".join(sections)
+
+
+def _format_retrieval_response_json(response: Dict[str, Any], include_answer: bool) -> str:
+    """Serialize the answer and sources of a response as JSON."""
+    payload = {}
+    if include_answer:
+        payload["answer"] = response.get("result", response.get("answer"))
+    payload["sources"] = [
+        {
+            "source": doc.metadata.get("source", "Unknown"),
+            "page": doc.metadata.get("page"),
+        }
+        for doc in response.get("source_documents") or []
+    ]
+    
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def format_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Check which API keys are configured.
+    Convert path-like metadata values to strings.
+    
+    Vector stores persist metadata with pickle or send it to a database,
+    so values should be plain strings rather than Path objects. Metadata
+    without path-like values (the usual case) is returned as-is, without
+    copying.
     
+    Args:
+        metadata: Document metadata
+        
     Returns:
-        Dictionary mapping provider names to availability status
+        Metadata with os.PathLike values replaced by their string path
     """
+    if not any(hasattr(value, "__fspath__") for value in metadata.values()):
+        return metadata
+    
     return {
-        "openai": bool(os.getenv("OPENAI_API_KEY")),
-        "huggingface": bool(os.getenv("HF_TOKEN")),
-        "pinecone": bool(os.getenv("PINECONE_API_KEY")),
+        key: os.fspath(value) if hasattr(value, "__fspath__") else value
+        for key, value in metadata.items()
     }
 
 
+# Result of the last check_api_keys() call and when it was made
+_api_key_status: Optional[Tuple[float, Dict[str, bool]]] = None
+
+
+def check_api_keys(ttl: float = 60.0) -> Dict[str, bool]:
+    """
+    Check which API keys are configured.
+    
+    The result is reused for ttl seconds, so frequent callers (e.g. a
+    health check) do not inspect the environment every time, while keys
+    set later are still picked up.
+    
+    Args:
+        ttl: Seconds a result is reused (0 always checks the environment)
+    
+    Returns:
+        Dictionary mapping provider names to availability status
+    """
+    global _api_key_status
+    
+    now = time.monotonic()
+    if _api_key_status is None or now - _api_key_status[0] >= ttl:
+        _api_key_status = (now, {
+            "openai": bool(os.getenv("OPENAI_API_KEY")),
+            "huggingface": bool(os.getenv("HF_TOKEN")),
+            "pinecone": bool(os.getenv("PINECONE_API_KEY")),
+        })
+    
+    return dict(_api_key_status[1])
+
+
 # TODO: Add NIS-2 specific utility functions
 # - parse_nis2_article_reference(): Parse article references from text
 # - calculate_compliance_score(): Calculate overall compliance score
@@ -1,5 +1,30 @@
-"""Vector store implementations for document retrieval."""
+"""Vector store implementations for document retrieval.
 
-from .vectorstore_factory import get_vectorstore, create_vectorstore_from_docs
+Public names are resolved on first access (PEP 562), so importing the
+package does not load FAISS and NumPy until a vector store is needed.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .vectorstore_factory import get_vectorstore, create_vectorstore_from_docs
+
+_LAZY_ATTRIBUTES = {
+    "get_vectorstore": ".vectorstore_factory",
+    "create_vectorstore_from_docs": ".vectorstore_factory",
+}
 
 __all__ = ["get_vectorstore", "create_vectorstore_from_docs"]
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
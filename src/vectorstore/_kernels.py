@@ -0,0 +1,108 @@
+"""
+Numba-compiled kernels for the flat vector store.
+Used for normalization and top-k cosine scoring when simsimd is unavailable.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator leaving functions uncompiled when numba is missing."""
+        def decorator(func):
+            return func
+        return decorator
+
+    prange = range
+
+
+# 1-D and 2-D variants are kept separate so every kernel stays type-stable.
+
+@njit(fastmath=True, cache=True)
+def normalize_1d(vector):
+    """
+    L2-normalize a single vector.
+
+    Args:
+        vector: float32 array of shape (d,)
+
+    Returns:
+        Normalized copy of the vector (zero vectors are returned unchanged)
+    """
+    norm = 0.0
+    for j in range(vector.shape[0]):
+        norm += vector[j] * vector[j]
+    norm = np.sqrt(norm)
+    if norm == 0.0:
+        norm = 1.0
+
+    out = np.empty_like(vector)
+    for j in range(vector.shape[0]):
+        out[j] = vector[j] / norm
+    return out
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def normalize_2d(matrix):
+    """
+    L2-normalize each row of a matrix.
+
+    Args:
+        matrix: float32 array of shape (N, d)
+
+    Returns:
+        Row-normalized copy of the matrix (zero rows are returned unchanged)
+    """
+    n_rows, dim = matrix.shape
+    out = np.empty_like(matrix)
+
+    for i in prange(n_rows):
+        norm = 0.0
+        for j in range(dim):
+            norm += matrix[i, j] * matrix[i, j]
+        norm = np.sqrt(norm)
+        if norm == 0.0:
+            norm = 1.0
+        for j in range(dim):
+            out[i, j] = matrix[i, j] / norm
+
+    return out
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def cosine_topk(query, matrix, scales, k):
+    """
+    Score a query against row-normalized vectors and select the top k.
+
+    Args:
+        query: float32 array of shape (d,)
+        matrix: Row-normalized float32 or int8 array of shape (N, d)
+        scales: Per-row scales for int8 matrices, or an empty array
+        k: Number of results to return (1 <= k <= N)
+
+    Returns:
+        Tuple of (row indices, cosine similarities), best match first
+    """
+    n_rows, dim = matrix.shape
+    query = normalize_1d(query)
+    has_scales = scales.shape[0] > 0
+
+    scores = np.empty(n_rows, dtype=np.float32)
+    for i in prange(n_rows):
+        acc = 0.0
+        for j in range(dim):
+            acc += matrix[i, j] * query[j]
+        if has_scales:
+            acc *= scales[i]
+        scores[i] = acc
+
+    # Partial selection is O(N); only the k winners get fully sorted
+    negated = -scores
+    top = np.argpartition(negated, k - 1)[:k]
+    top = top[np.argsort(negated[top])]
+    return top, scores[top]
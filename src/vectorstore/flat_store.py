@@ -0,0 +1,408 @@
+"""
+Flat in-memory vector store with SIMD-accelerated cosine scoring.
+Keeps the whole corpus in one contiguous embedding matrix.
+"""
+
+import pickle
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+from langchain.schema import Document
+from langchain.vectorstores.base import VectorStore
+
+from ._kernels import NUMBA_AVAILABLE, cosine_topk, normalize_2d
+from .quantize import quantize_int8
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# Rows of int8 codes converted to float32 at a time on the numpy path
+SCORE_BLOCK_ROWS = 65_536
+
+
+class FlatVectorStore(VectorStore):
+    """
+    Exact-search vector store backed by a contiguous embedding matrix.
+
+    Vectors are L2-normalized once at insert time and stored as a single
+    ``(N, d)`` float32 array, so each query is scored against the whole
+    corpus in one vectorized call. Scoring uses SimSIMD cosine kernels
+    (AVX2/AVX-512/NEON) when the package is installed, Numba-compiled
+    kernels when only numba is available, and a numpy matrix-vector
+    product otherwise.
+
+    Once the float32 matrix grows beyond ``quant_threshold_bytes`` the store
+    switches to int8 codes with a per-vector scale, which cuts memory and
+    scan bandwidth by 4x. Queries stay float32 on the numpy path and use
+    SimSIMD's int8 kernels otherwise.
+
+    Results of text queries are memoized in a per-instance LRU cache keyed
+    on ``(query, k)``, so a repeated question skips both the query
+    embedding and the scan. Adding documents bumps a version number that
+    is part of the key, so cached results never outlive a change of the
+    corpus. Cache updates are locked, so searches may run in parallel
+    threads.
+    """
+
+    MATRIX_FILE = "embeddings.npy"
+    SCALES_FILE = "scales.npy"
+    DOCUMENTS_FILE = "documents.pkl"
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        quant_threshold_bytes: Optional[int] = None,
+        search_cache_size: int = 1024,
+    ):
+        """
+        Initialize an empty flat vector store.
+
+        Args:
+            embedding: Embeddings instance used for documents and queries
+            quant_threshold_bytes: Size of the float32 matrix above which
+                                   vectors are stored as int8. If None,
+                                   vectors are always stored as float32.
+            search_cache_size: Maximum number of cached query results
+                               (0 disables the cache)
+        """
+        self.embedding = embedding
+        self.quant_threshold_bytes = quant_threshold_bytes
+        self.search_cache_size = search_cache_size
+        self._search_cache: "OrderedDict[tuple, List[Tuple[Document, float]]]" = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        self._version = 0
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+        self.scales: Optional[np.ndarray] = None
+        self.documents: List[Document] = []
+        self.ids: List[str] = []
+
+    @property
+    def embeddings(self) -> Embeddings:
+        """Embeddings instance used by this store."""
+        return self.embedding
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """
+        Embed and add texts to the store.
+
+        Args:
+            texts: Texts to add
+            metadatas: Optional metadata per text
+            **kwargs: Unused, accepted for VectorStore compatibility
+
+        Returns:
+            List of IDs of the added texts
+        """
+        texts = list(texts)
+        vectors = self.embedding.embed_documents(texts)
+        return self.add_embeddings(texts, vectors, metadatas)
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+    ) -> List[str]:
+        """
+        Add texts with precomputed embeddings to the store.
+
+        Args:
+            texts: Texts to add
+            embeddings: Embedding vector per text
+            metadatas: Optional metadata per text
+
+        Returns:
+            List of IDs of the added texts
+        """
+        if not texts:
+            return []
+
+        if metadatas is None:
+            metadatas = [{} for _ in texts]
+
+        vectors = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+
+        if self.scales is not None:
+            codes, scales = quantize_int8(vectors)
+            self.matrix = np.vstack([self.matrix, codes])
+            self.scales = np.concatenate([self.scales, scales])
+        elif self.matrix.size == 0:
+            self.matrix = np.ascontiguousarray(vectors)
+        else:
+            self.matrix = np.vstack([self.matrix, vectors])
+
+        self._maybe_quantize()
+        self._version += 1
+
+        ids = [str(uuid.uuid4()) for _ in texts]
+        self.ids.extend(ids)
+        self.documents.extend(
+            Document(page_content=text, metadata=metadata)
+            for text, metadata in zip(texts, metadatas)
+        )
+
+        return ids
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any,
+    ) -> List[Document]:
+        """
+        Return the documents most similar to a query.
+
+        Args:
+            query: Query text
+            k: Number of documents to return
+            **kwargs: Unused, accepted for VectorStore compatibility
+
+        Returns:
+            List of Documents ordered by descending similarity
+        """
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        """
+        Return the documents most similar to a query with cosine similarity.
+
+        Args:
+            query: Query text
+            k: Number of documents to return
+            **kwargs: Unused, accepted for VectorStore compatibility
+
+        Returns:
+            List of (Document, similarity) tuples ordered by descending similarity
+        """
+        if self.search_cache_size <= 0:
+            vector = self.embedding.embed_query(query)
+            return self.similarity_search_by_vector_with_score(vector, k)
+
+        # Batched retrieval searches from several threads; the lock covers
+        # only the cache bookkeeping, not the embedding call and the scan
+        key = (query, k, self._version)
+        with self._search_cache_lock:
+            results = self._search_cache.get(key)
+            if results is not None:
+                self._search_cache.move_to_end(key)
+
+        if results is None:
+            vector = self.embedding.embed_query(query)
+            results = self.similarity_search_by_vector_with_score(vector, k)
+            with self._search_cache_lock:
+                self._search_cache[key] = results
+                if len(self._search_cache) > self.search_cache_size:
+                    self._search_cache.popitem(last=False)
+
+        return list(results)
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        **kwargs: Any,
+    ) -> List[Document]:
+        """
+        Return the documents most similar to an embedding vector.
+
+        Args:
+            embedding: Query embedding
+            k: Number of documents to return
+            **kwargs: Unused, accepted for VectorStore compatibility
+
+        Returns:
+            List of Documents ordered by descending similarity
+        """
+        return [
+            doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)
+        ]
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4,
+    ) -> List[Tuple[Document, float]]:
+        """
+        Score the whole corpus against an embedding and return the top k.
+
+        Args:
+            embedding: Query embedding
+            k: Number of documents to return
+
+        Returns:
+            List of (Document, similarity) tuples ordered by descending similarity
+        """
+        if not self.documents or k <= 0:
+            return []
+
+        query = np.asarray(embedding, dtype=np.float32)
+        k = min(k, len(self.documents))
+
+        if simsimd is None and NUMBA_AVAILABLE:
+            scales = self.scales if self.scales is not None else np.empty(0, np.float32)
+            top, top_scores = cosine_topk(query, self.matrix, scales, k)
+            return [(self.documents[i], float(s)) for i, s in zip(top, top_scores)]
+
+        scores = self._cosine_similarity(query)
+
+        # Partial selection is O(N); only the k winners get fully sorted
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [(self.documents[i], float(scores[i])) for i in top]
+
+    def save_local(self, folder_path: str) -> None:
+        """
+        Save the embedding matrix and documents to a folder.
+
+        Args:
+            folder_path: Directory to write the store to
+        """
+        path = Path(folder_path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        np.save(path / self.MATRIX_FILE, self.matrix)
+        if self.scales is not None:
+            np.save(path / self.SCALES_FILE, self.scales)
+        with open(path / self.DOCUMENTS_FILE, "wb") as f:
+            pickle.dump((self.documents, self.ids), f)
+
+    @classmethod
+    def load_local(
+        cls,
+        folder_path: str,
+        embeddings: Embeddings,
+        quant_threshold_bytes: Optional[int] = None,
+        search_cache_size: int = 1024,
+    ) -> "FlatVectorStore":
+        """
+        Load a store previously written with save_local().
+
+        Args:
+            folder_path: Directory containing the saved store
+            embeddings: Embeddings instance for queries
+            quant_threshold_bytes: Threshold for switching to int8 storage
+            search_cache_size: Maximum number of cached query results
+
+        Returns:
+            FlatVectorStore instance
+        """
+        path = Path(folder_path)
+
+        store = cls(
+            embeddings,
+            quant_threshold_bytes=quant_threshold_bytes,
+            search_cache_size=search_cache_size,
+        )
+        store.matrix = np.load(path / cls.MATRIX_FILE)
+        if (path / cls.SCALES_FILE).exists():
+            store.scales = np.load(path / cls.SCALES_FILE)
+        with open(path / cls.DOCUMENTS_FILE, "rb") as f:
+            store.documents, store.ids = pickle.load(f)
+
+        return store
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        quant_threshold_bytes: Optional[int] = None,
+        search_cache_size: int = 1024,
+        **kwargs: Any,
+    ) -> "FlatVectorStore":
+        """
+        Create a flat vector store from texts.
+
+        Args:
+            texts: Texts to index
+            embedding: Embeddings instance
+            metadatas: Optional metadata per text
+            quant_threshold_bytes: Threshold for switching to int8 storage
+            search_cache_size: Maximum number of cached query results
+            **kwargs: Unused, accepted for VectorStore compatibility
+
+        Returns:
+            FlatVectorStore instance
+        """
+        store = cls(
+            embedding,
+            quant_threshold_bytes=quant_threshold_bytes,
+            search_cache_size=search_cache_size,
+        )
+        store.add_texts(texts, metadatas=metadatas)
+        return store
+
+    def _select_relevance_score_fn(self):
+        """Scores are cosine similarities already, so pass them through."""
+        return lambda score: score
+
+    def _cosine_similarity(self, query: np.ndarray) -> np.ndarray:
+        """
+        Compute cosine similarity between a query and every stored vector.
+
+        Args:
+            query: Query vector of shape (d,)
+
+        Returns:
+            Similarity per stored vector, shape (N,)
+        """
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        if simsimd is not None:
+            if self.scales is not None:
+                # Cosine is scale-invariant, so int8 codes compare directly
+                query, _ = quantize_int8(query)
+            else:
+                query = query[np.newaxis, :]
+            distances = np.asarray(simsimd.cdist(query, self.matrix, metric="cosine"))
+            return 1.0 - distances.reshape(-1)
+
+        if self.scales is not None:
+            # int8 @ float32 would promote the whole matrix to a float32
+            # temporary; casting one block of rows at a time bounds that copy
+            query = query.astype(np.float32, copy=False)
+            scores = np.empty(self.matrix.shape[0], dtype=np.float32)
+            for start in range(0, self.matrix.shape[0], SCORE_BLOCK_ROWS):
+                block = self.matrix[start:start + SCORE_BLOCK_ROWS]
+                scores[start:start + block.shape[0]] = block.astype(np.float32) @ query
+            return scores * self.scales
+        return self.matrix @ query
+
+    def _maybe_quantize(self) -> None:
+        """Switch float32 storage to int8 once it exceeds the size threshold."""
+        if (
+            self.scales is None
+            and self.quant_threshold_bytes is not None
+            and self.matrix.nbytes > self.quant_threshold_bytes
+        ):
+            self.matrix, self.scales = quantize_int8(self.matrix)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row of a matrix, leaving zero rows unchanged."""
+    if NUMBA_AVAILABLE:
+        return normalize_2d(matrix)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
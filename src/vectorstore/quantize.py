@@ -0,0 +1,32 @@
+"""
+Scalar quantization helpers for stored embedding vectors.
+Symmetric per-vector int8 quantization with float32 scales.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize vectors to int8 with one scale per vector.
+
+    Each vector is divided by ``max(|v|) / 127`` and rounded, so the largest
+    component maps to +/-127.
+
+    Args:
+        vectors: Float array of shape (d,) or (N, d)
+
+    Returns:
+        Tuple of (int8 codes of shape (N, d), float32 scales of shape (N,))
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+
+    codes = np.clip(np.rint(vectors / scales[:, np.newaxis]), -127, 127).astype(np.int8)
+
+    return codes, scales.astype(np.float32)
+
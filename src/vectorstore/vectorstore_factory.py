@@ -1,15 +1,47 @@
 """
 Vector store factory for creating and managing vector databases.
-Supports FAISS (local) with abstraction for Pinecone, Weaviate, and Chroma.
+Supports FAISS and a flat in-memory store (local) with abstraction for
+Pinecone, Weaviate, and Chroma.
 """
 
+import hashlib
+import logging
 import os
+import pickle
+import platform
+import uuid
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional
-from langchain.vectorstores import FAISS
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
+
+import numpy as np
 from langchain.embeddings.base import Embeddings
 from langchain.schema import Document
 from langchain.vectorstores.base import VectorStore
+from langchain.vectorstores.utils import DistanceStrategy
+from tqdm import tqdm
+
+from ..embeddings.embedding_cache import embedding_namespace, load_or_compute
+from .flat_store import FlatVectorStore
+
+# FAISS is imported by the functions that use it (as in the chains'
+# SemanticCache), so with another provider its native library is only
+# loaded if the semantic response cache is enabled
+if TYPE_CHECKING:
+    import faiss
+    from langchain.vectorstores import FAISS
+
+logger = logging.getLogger("nis2expert")
+
+# Number of loaded FAISS stores kept by _get_faiss_vectorstore
+FAISS_CACHE_SIZE = 8
+
+# Minimum number of vectors sampled to train FAISS quantizers
+TRAIN_SAMPLE_SIZE = 256_000
+
+_faiss_checked = False
+_loaded_faiss: "OrderedDict[tuple, FAISS]" = OrderedDict()
+_gpu_resources: "Dict[int, faiss.StandardGpuResources]" = {}
 
 
 def get_vectorstore(
@@ -21,7 +53,7 @@ def get_vectorstore(
     Load or create a vector store based on provider.
     
     Args:
-        provider: Vector store provider ("faiss", "pinecone", "weaviate", "chroma")
+        provider: Vector store provider ("faiss", "flat", "pinecone", "weaviate", "chroma")
         embeddings: Embeddings instance to use
         **kwargs: Provider-specific arguments
         
@@ -31,30 +63,17 @@ def get_vectorstore(
     Raises:
         ValueError: If provider is not supported
     """
-    provider = provider.lower()
-    
     if embeddings is None:
         raise ValueError("Embeddings instance is required")
     
-    if provider == "faiss":
-        return _get_faiss_vectorstore(embeddings, **kwargs)
-    elif provider == "pinecone":
-        return _get_pinecone_vectorstore(embeddings, **kwargs)
-    elif provider == "weaviate":
-        return _get_weaviate_vectorstore(embeddings, **kwargs)
-    elif provider == "chroma":
-        return _get_chroma_vectorstore(embeddings, **kwargs)
-    else:
-        raise ValueError(
-            f"Unsupported vector store provider: {provider}. "
-            f"Supported providers: faiss, pinecone, weaviate, chroma"
-        )
+    return _provider_function(_LOAD_REGISTRY, provider)(embeddings, **kwargs)
 
 
 def create_vectorstore_from_docs(
     documents: List[Document],
     embeddings: Embeddings,
     provider: str = "faiss",
+    deduplicate: bool = True,
     **kwargs
 ) -> VectorStore:
     """
@@ -64,43 +83,145 @@ def create_vectorstore_from_docs(
         documents: List of Document objects to index
         embeddings: Embeddings instance to use
         provider: Vector store provider
+        deduplicate: Whether to index chunks with identical text only once
         **kwargs: Provider-specific arguments
         
     Returns:
         VectorStore instance with indexed documents
+        
+    Raises:
+        ValueError: If provider is not supported
     """
-    provider = provider.lower()
+    create = _provider_function(_CREATE_REGISTRY, provider)
     
-    if provider == "faiss":
-        return _create_faiss_from_docs(documents, embeddings, **kwargs)
-    elif provider == "pinecone":
-        return _create_pinecone_from_docs(documents, embeddings, **kwargs)
-    elif provider == "weaviate":
-        return _create_weaviate_from_docs(documents, embeddings, **kwargs)
-    elif provider == "chroma":
-        return _create_chroma_from_docs(documents, embeddings, **kwargs)
-    else:
-        raise ValueError(f"Unsupported vector store provider: {provider}")
+    if deduplicate:
+        documents = drop_duplicate_documents(documents)
+    
+    return create(documents, embeddings, **kwargs)
+
+
+def drop_duplicate_documents(documents: List[Document]) -> List[Document]:
+    """
+    Keep only the first chunk of each distinct text.
+    
+    Regulatory corpora repeat headers, recitals and article boilerplate
+    across files; identical chunks would be embedded and stored repeatedly
+    without adding anything to retrieval. Chunks are keyed by a 128-bit
+    BLAKE2b digest of their text, which is cheaper to hash and hold than
+    the text itself.
+    
+    Args:
+        documents: Chunks to index
+        
+    Returns:
+        Distinct chunks in their original order
+    """
+    unique = {}
+    for doc in documents:
+        digest = hashlib.blake2b(doc.page_content.encode("utf-8"), digest_size=16).digest()
+        unique.setdefault(digest, doc)
+    
+    if len(unique) < len(documents):
+        logger.info(
+            "Dropped %d duplicate chunks (%.1f%% of %d)",
+            len(documents) - len(unique),
+            100 * (1 - len(unique) / len(documents)),
+            len(documents),
+        )
+    
+    return list(unique.values())
 
 
 # FAISS Implementation (Local Vector Store)
 
+def configure_faiss(num_threads: Optional[int] = None) -> None:
+    """
+    Set the FAISS thread count and check that SIMD kernels are available.
+    
+    OpenMP uses one thread per core by default. That oversubscribes the CPU
+    when searches already run in parallel threads (e.g. batched answering)
+    or next to worker processes, so the count can be capped. On first use,
+    a warning is logged if FAISS was loaded without AVX2 kernels on x86-64,
+    where distance computations then run several times slower.
+    
+    Args:
+        num_threads: Number of OpenMP threads. Defaults to the
+                     FAISS_NUM_THREADS environment variable; if neither is
+                     set, the OpenMP default is kept.
+    """
+    global _faiss_checked
+    
+    import faiss
+    
+    if num_threads is None and os.getenv("FAISS_NUM_THREADS"):
+        num_threads = int(os.environ["FAISS_NUM_THREADS"])
+    if num_threads:
+        faiss.omp_set_num_threads(num_threads)
+    
+    if _faiss_checked:
+        return
+    _faiss_checked = True
+    
+    compile_options = faiss.get_compile_options()
+    logger.debug(
+        "FAISS compile options: %s; %d threads", compile_options, faiss.omp_get_max_threads()
+    )
+    if platform.machine().lower() in ("x86_64", "amd64") and "AVX2" not in compile_options:
+        logger.warning(
+            "FAISS was loaded without AVX2 support; vector search will be slow. "
+            "Install a SIMD-enabled build with: pip install -U faiss-cpu"
+        )
+
+
 def _get_faiss_vectorstore(
     embeddings: Embeddings,
     index_path: Optional[str] = None,
+    mmap: bool = True,
+    num_threads: Optional[int] = None,
+    device: str = "cpu",
+    gpu_id: Optional[int] = None,
     **kwargs
-) -> FAISS:
+) -> "FAISS":
     """
     Load existing FAISS vector store.
     
+    With mmap enabled the index file is memory-mapped read-only instead of
+    being parsed into freshly allocated memory, so loading is near-instant
+    and vectors are paged in on demand. A memory-mapped store cannot be
+    extended with add_texts(); rebuild it instead.
+    
+    Loaded stores are cached by path, file modification times and
+    embeddings instance, so loading the same unchanged index again returns
+    the same object instead of deserializing the docstore once more.
+    Callers share that object and must not modify it.
+    
+    With device "cuda" the index is copied to GPU memory (see
+    _index_to_gpu). Searches are then bound by GPU memory bandwidth instead
+    of DRAM, but each call pays a PCIe round trip, so this pays off for
+    large corpora searched with batches of queries.
+    
     Args:
         embeddings: Embeddings instance
         index_path: Path to saved FAISS index
+        mmap: Whether to memory-map the index file
+        num_threads: Number of FAISS threads (see configure_faiss)
+        device: Device searched on ("cpu" or "cuda")
+        gpu_id: GPU to use with device "cuda". If None, the index is
+                sharded across all visible GPUs.
         **kwargs: Additional FAISS arguments
         
     Returns:
         FAISS vector store instance
     """
+    import faiss
+    from langchain.vectorstores import FAISS
+    
+    device = device.lower()
+    if device not in ("cpu", "cuda"):
+        raise ValueError(f"Unsupported FAISS device: {device}. Supported devices: cpu, cuda")
+    
+    configure_faiss(num_threads)
+    
     if index_path is None:
         index_path = "data/vectorstore/faiss_index"
     
@@ -112,43 +233,553 @@ def _get_faiss_vectorstore(
             "Create one using create_vectorstore_from_docs()"
         )
     
-    vectorstore = FAISS.load_local(str(index_path), embeddings)
+    # The cached store references the embeddings, which keeps their id()
+    # from being reused by another object while the entry exists
+    key = (
+        str(index_path.resolve()),
+        tuple(path.stat().st_mtime_ns for path in sorted(index_path.iterdir())),
+        mmap,
+        device,
+        gpu_id,
+        id(embeddings),
+    )
+    vectorstore = _loaded_faiss.get(key)
+    if vectorstore is not None:
+        _loaded_faiss.move_to_end(key)
+        return vectorstore
+    
+    if mmap:
+        vectorstore = _load_faiss_mmap(index_path, embeddings)
+    else:
+        vectorstore = FAISS.load_local(str(index_path), embeddings)
+    
+    # Indexes built by _create_faiss_from_docs use cosine similarity
+    # (inner product over normalized vectors); the wrapper settings for
+    # that are not persisted, so restore them from the index metric
+    if vectorstore.index.metric_type == faiss.METRIC_INNER_PRODUCT:
+        vectorstore.distance_strategy = DistanceStrategy.MAX_INNER_PRODUCT
+        vectorstore._normalize_L2 = True
+    
+    if device == "cuda":
+        vectorstore.index = _index_to_gpu(vectorstore.index, gpu_id)
+    
+    _loaded_faiss[key] = vectorstore
+    if len(_loaded_faiss) > FAISS_CACHE_SIZE:
+        _loaded_faiss.popitem(last=False)
+    
     return vectorstore
 
 
+def _load_faiss_mmap(index_path: Path, embeddings: Embeddings) -> "FAISS":
+    """
+    Load a FAISS store saved with save_local(), memory-mapping the index.
+    
+    Args:
+        index_path: Directory containing index.faiss and index.pkl
+        embeddings: Embeddings instance
+        
+    Returns:
+        FAISS vector store backed by the memory-mapped index
+    """
+    import faiss
+    from langchain.vectorstores import FAISS
+    
+    # IO_FLAG_MMAP alone still copies the codes of flat and scalar-quantizer
+    # storage into memory; IO_FLAG_MMAP_IFC (FAISS >= 1.10) serves them
+    # straight from the mapped file. Older FAISS versions only have the former.
+    mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+    index = faiss.read_index(str(index_path / "index.faiss"), mmap_flag | faiss.IO_FLAG_READ_ONLY)
+    
+    with open(index_path / "index.pkl", "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    
+    return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+
+def _index_to_gpu(index: "faiss.Index", gpu_id: Optional[int] = None) -> "faiss.Index":
+    """
+    Copy a FAISS index to GPU memory.
+    
+    Flat, IVF and scalar-quantizer indexes have GPU implementations; HNSW
+    indexes do not and are rejected by FAISS. The GPU resources (scratch
+    memory and streams) are created once per device and reused.
+    
+    Args:
+        index: CPU index
+        gpu_id: GPU to copy the index to. If None and several GPUs are
+                visible, the vectors are split across all of them.
+                
+    Returns:
+        GPU index
+        
+    Raises:
+        ImportError: If FAISS was built without GPU support
+    """
+    import faiss
+    
+    if not hasattr(faiss, "StandardGpuResources"):
+        raise ImportError(
+            "A GPU build of FAISS is required for device 'cuda'. "
+            "Install it with: pip install faiss-gpu"
+        )
+    
+    if gpu_id is None and faiss.get_num_gpus() > 1:
+        options = faiss.GpuMultipleClonerOptions()
+        options.shard = True
+        return faiss.index_cpu_to_all_gpus(index, options)
+    
+    gpu_id = gpu_id or 0
+    if gpu_id not in _gpu_resources:
+        _gpu_resources[gpu_id] = faiss.StandardGpuResources()
+    return faiss.index_cpu_to_gpu(_gpu_resources[gpu_id], gpu_id, index)
+
+
 def _create_faiss_from_docs(
     documents: List[Document],
     embeddings: Embeddings,
     index_path: Optional[str] = None,
     save: bool = True,
+    index_type: str = "auto",
+    hnsw_threshold: int = 100_000,
+    hnsw_m: int = 32,
+    hnsw_ef_construction: int = 200,
+    hnsw_ef_search: int = 64,
+    ivfpq_min_vectors: int = 10_000,
+    ivfpq_m: int = 64,
+    ivfpq_nprobe: int = 16,
+    quantize: Union[bool, str] = False,
+    index_factory: Optional[str] = None,
+    add_batch_size: int = 8192,
+    embedding_batch_size: Optional[int] = 1024,
+    matrix_cache_dir: Optional[str] = None,
+    num_threads: Optional[int] = None,
+    device: str = "cpu",
+    gpu_id: Optional[int] = None,
     **kwargs
-) -> FAISS:
+) -> "FAISS":
     """
     Create FAISS vector store from documents.
     
+    Vectors are L2-normalized and searched by inner product (cosine
+    similarity). With index_type "auto", an exact IndexFlatIP is used for
+    corpora below hnsw_threshold chunks and an IndexHNSWFlat graph above it.
+    The compressed "ivfpq" index is opt-in.
+    
     Args:
         documents: Documents to index
         embeddings: Embeddings instance
         index_path: Path to save the index
         save: Whether to save the index to disk
+        index_type: Index type ("auto", "flat", "hnsw" or "ivfpq")
+        hnsw_threshold: Number of chunks from which "auto" switches to HNSW
+        hnsw_m: Number of graph neighbors per node (HNSW)
+        hnsw_ef_construction: Candidate list size while building (HNSW)
+        hnsw_ef_search: Candidate list size while searching (HNSW)
+        ivfpq_min_vectors: Number of chunks below which "ivfpq" builds a
+                           flat index instead (IVFPQ)
+        ivfpq_m: Number of PQ sub-quantizers; must divide the dimension (IVFPQ)
+        ivfpq_nprobe: Number of inverted lists searched per query (IVFPQ)
+        quantize: Scalar quantization of flat and HNSW vectors: "int8"
+                  (or True), "fp16", or "fp32" (or False) for none
+        index_factory: FAISS index factory string (e.g. "IVF4096,PQ64").
+                       If given, it is used instead of index_type.
+        add_batch_size: Number of vectors added to the index at a time
+        embedding_batch_size: Number of documents per embed_documents call
+                              (None or 0 embeds all documents in one call)
+        matrix_cache_dir: Directory caching the embedding matrix of the
+                          whole corpus (see _embed_texts)
+        num_threads: Number of FAISS threads (see configure_faiss)
+        device: Device searched on ("cpu" or "cuda"). The index is built
+                and saved on the CPU and then copied to the GPU.
+        gpu_id: GPU to use with device "cuda" (None for all GPUs)
         **kwargs: Additional FAISS arguments
         
     Returns:
         FAISS vector store instance
     """
+    import faiss
+    from langchain.docstore.in_memory import InMemoryDocstore
+    from langchain.vectorstores import FAISS
+    
+    if not documents:
+        raise ValueError("No documents provided for indexing")
+    
+    device = device.lower()
+    if device not in ("cpu", "cuda"):
+        raise ValueError(f"Unsupported FAISS device: {device}. Supported devices: cpu, cuda")
+    
+    configure_faiss(num_threads)
+    
+    texts = [doc.page_content for doc in documents]
+    vectors = _embed_texts(texts, embeddings, embedding_batch_size, matrix_cache_dir)
+    faiss.normalize_L2(vectors)
+    
+    index = _build_faiss_index(
+        vectors,
+        index_type=index_type,
+        hnsw_threshold=hnsw_threshold,
+        hnsw_m=hnsw_m,
+        hnsw_ef_construction=hnsw_ef_construction,
+        hnsw_ef_search=hnsw_ef_search,
+        ivfpq_min_vectors=ivfpq_min_vectors,
+        ivfpq_m=ivfpq_m,
+        ivfpq_nprobe=ivfpq_nprobe,
+        quantize=quantize,
+        index_factory=index_factory,
+        add_batch_size=add_batch_size,
+    )
+    
+    ids = [str(uuid.uuid4()) for _ in documents]
+    vectorstore = FAISS(
+        embeddings,
+        index,
+        InMemoryDocstore(dict(zip(ids, documents))),
+        dict(enumerate(ids)),
+        normalize_L2=True,
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+    )
+    
+    # save_local() creates the directory itself
+    if save and index_path:
+        vectorstore.save_local(str(index_path))
+        _loaded_faiss.clear()
+    
+    if device == "cuda":
+        vectorstore.index = _index_to_gpu(vectorstore.index, gpu_id)
+    
+    return vectorstore
+
+
+# Flat Implementation (Local In-Memory Vector Store)
+
+def _get_flat_vectorstore(
+    embeddings: Embeddings,
+    index_path: Optional[str] = None,
+    quant_threshold_bytes: Optional[int] = None,
+    search_cache_size: int = 1024,
+    **kwargs
+) -> FlatVectorStore:
+    """
+    Load existing flat vector store.
+    
+    Args:
+        embeddings: Embeddings instance
+        index_path: Path to saved flat index
+        quant_threshold_bytes: Matrix size above which vectors are stored as int8
+        search_cache_size: Maximum number of cached query results
+        **kwargs: Additional arguments (unused)
+        
+    Returns:
+        FlatVectorStore instance
+    """
+    if index_path is None:
+        index_path = "data/vectorstore/flat_index"
+    
+    index_path = Path(index_path)
+    
+    if not index_path.exists():
+        raise FileNotFoundError(
+            f"Flat index not found at {index_path}. "
+            "Create one using create_vectorstore_from_docs()"
+        )
+    
+    return FlatVectorStore.load_local(
+        str(index_path),
+        embeddings,
+        quant_threshold_bytes=quant_threshold_bytes,
+        search_cache_size=search_cache_size,
+    )
+
+
+def _create_flat_from_docs(
+    documents: List[Document],
+    embeddings: Embeddings,
+    index_path: Optional[str] = None,
+    save: bool = True,
+    quant_threshold_bytes: Optional[int] = None,
+    search_cache_size: int = 1024,
+    embedding_batch_size: Optional[int] = 1024,
+    matrix_cache_dir: Optional[str] = None,
+    **kwargs
+) -> FlatVectorStore:
+    """
+    Create flat vector store from documents.
+    
+    Args:
+        documents: Documents to index
+        embeddings: Embeddings instance
+        index_path: Path to save the index
+        save: Whether to save the index to disk
+        quant_threshold_bytes: Matrix size above which vectors are stored as int8
+        search_cache_size: Maximum number of cached query results
+        embedding_batch_size: Number of documents per embed_documents call
+                              (None or 0 embeds all documents in one call)
+        matrix_cache_dir: Directory caching the embedding matrix of the
+                          whole corpus (see _embed_texts)
+        **kwargs: Additional arguments (unused)
+        
+    Returns:
+        FlatVectorStore instance
+    """
     if not documents:
         raise ValueError("No documents provided for indexing")
     
-    vectorstore = FAISS.from_documents(documents, embeddings)
+    texts = [doc.page_content for doc in documents]
+    vectors = _embed_texts(texts, embeddings, embedding_batch_size, matrix_cache_dir)
+    
+    vectorstore = FlatVectorStore(
+        embeddings,
+        quant_threshold_bytes=quant_threshold_bytes,
+        search_cache_size=search_cache_size,
+    )
+    vectorstore.add_embeddings(
+        texts,
+        vectors,
+        [doc.metadata for doc in documents],
+    )
     
     if save and index_path:
-        index_path = Path(index_path)
-        index_path.parent.mkdir(parents=True, exist_ok=True)
         vectorstore.save_local(str(index_path))
     
     return vectorstore
 
 
+def _embed_texts(
+    texts: List[str],
+    embeddings: Embeddings,
+    batch_size: Optional[int] = 1024,
+    cache_dir: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Embed texts in batches into a preallocated float32 matrix.
+    
+    Row i of the matrix is the vector of texts[i], so the texts and any
+    metadata kept in parallel lists line up with the index rows, and the
+    index is filled from one contiguous array in a single add call.
+    
+    Each batch is converted to float32 as soon as it is embedded, so the
+    much larger list-of-floats representation is only held for one batch
+    at a time. Progress is shown per batch. The embeddings split each call
+    into provider-sized requests themselves (e.g. token-capped concurrent
+    requests for OpenAI), so larger batches allow more parallel requests
+    at the cost of memory; without batch_size, all texts are embedded in
+    a single call.
+    
+    With cache_dir, the finished matrix is saved keyed by the model and
+    all chunk texts. Rebuilding an index from an unchanged corpus, e.g.
+    after a restart without a saved index, loads it in one read.
+    
+    Args:
+        texts: Texts to embed, in index order
+        embeddings: Embeddings instance
+        batch_size: Number of texts per embed_documents call (None or
+                    0 for a single call)
+        cache_dir: Directory caching whole embedding matrices (None disables)
+        
+    Returns:
+        Embedding matrix of shape (len(texts), d)
+    """
+    if cache_dir:
+        return load_or_compute(
+            texts,
+            embedding_namespace(embeddings),
+            cache_dir,
+            lambda: _embed_texts(texts, embeddings, batch_size),
+        )
+    
+    if not batch_size:
+        batch_size = len(texts)
+    
+    vectors = None
+    
+    starts = range(0, len(texts), batch_size)
+    for start in tqdm(starts, desc="Embedding documents", unit="batch", disable=len(starts) < 2):
+        batch = texts[start:start + batch_size]
+        batch_vectors = np.asarray(embeddings.embed_documents(batch), dtype=np.float32)
+        
+        if vectors is None:
+            vectors = np.empty((len(texts), batch_vectors.shape[1]), dtype=np.float32)
+        vectors[start:start + len(batch)] = batch_vectors
+    
+    return vectors
+
+
+def _build_faiss_index(
+    vectors: np.ndarray,
+    index_type: str = "auto",
+    hnsw_threshold: int = 100_000,
+    hnsw_m: int = 32,
+    hnsw_ef_construction: int = 200,
+    hnsw_ef_search: int = 64,
+    ivfpq_min_vectors: int = 10_000,
+    ivfpq_m: int = 64,
+    ivfpq_nprobe: int = 16,
+    quantize: Union[bool, str] = False,
+    index_factory: Optional[str] = None,
+    add_batch_size: int = 8192,
+) -> "faiss.Index":
+    """
+    Build an inner-product FAISS index over normalized vectors.
+    
+    The "ivfpq" index clusters vectors into about 4*sqrt(N) inverted lists
+    and stores each vector as ivfpq_m 8-bit product-quantizer codes. A query
+    scans only ivfpq_nprobe lists and compares compact codes instead of
+    float32 vectors, trading a little recall for much less memory and scan
+    time. Below ivfpq_min_vectors there is too little data to train the
+    quantizers well, so a flat index is built instead.
+    
+    With quantize "int8", flat and HNSW indexes store each dimension as an
+    8-bit code scaled to the trained per-dimension range. Memory and scan
+    bandwidth drop by 4x; normalized embeddings lose very little recall.
+    "fp16" halves them with practically no loss of recall.
+    
+    Any other index can be described by a FAISS index factory string
+    (e.g. "IVF4096,PQ64" or "HNSW32,SQ8"). ivfpq_nprobe and hnsw_ef_search
+    apply to its IVF and HNSW parts.
+    
+    Indexes that need training are trained on a random sample of the
+    vectors (see _train_index). Vectors are then added in slices of
+    add_batch_size, so the buffers FAISS allocates while encoding and
+    assigning them stay bounded regardless of corpus size.
+    
+    Args:
+        vectors: L2-normalized float32 matrix of shape (N, d)
+        index_type: Index type ("auto", "flat", "hnsw" or "ivfpq")
+        hnsw_threshold: Number of vectors from which "auto" switches to HNSW
+        hnsw_m: Number of graph neighbors per node (HNSW)
+        hnsw_ef_construction: Candidate list size while building (HNSW)
+        hnsw_ef_search: Candidate list size while searching (HNSW)
+        ivfpq_min_vectors: Number of vectors below which "ivfpq" falls back
+                           to a flat index
+        ivfpq_m: Number of PQ sub-quantizers; must divide the dimension
+        ivfpq_nprobe: Number of inverted lists searched per query
+        quantize: Scalar quantization of flat and HNSW vectors ("int8",
+                  "fp16" or "fp32"; True and False mean "int8" and "fp32")
+        index_factory: FAISS index factory string overriding index_type
+        add_batch_size: Number of vectors added to the index at a time
+        
+    Returns:
+        FAISS index containing all vectors
+        
+    Raises:
+        ValueError: If index_type is not supported
+    """
+    import faiss
+    
+    n_vectors, dimension = vectors.shape
+    index_type = index_type.lower()
+    
+    if index_factory:
+        index = faiss.index_factory(dimension, index_factory, faiss.METRIC_INNER_PRODUCT)
+        
+        # Search parameters of the factory's sub-indexes ("nprobe" of the
+        # IVF part, "efSearch" of the HNSW part); saved with the index
+        parameters = faiss.ParameterSpace()
+        if faiss.try_extract_index_ivf(index) is not None:
+            parameters.set_index_parameter(index, "nprobe", ivfpq_nprobe)
+        if "HNSW" in index_factory.upper():
+            parameters.set_index_parameter(index, "efSearch", hnsw_ef_search)
+        
+        return _fill_index(index, vectors, add_batch_size)
+    
+    if index_type == "auto":
+        index_type = "flat" if n_vectors < hnsw_threshold else "hnsw"
+    elif index_type == "ivfpq" and n_vectors < ivfpq_min_vectors:
+        index_type = "flat"
+    
+    qtype = _scalar_quantizer_type(quantize)
+    
+    if index_type == "flat" and qtype is not None:
+        index = faiss.IndexScalarQuantizer(dimension, qtype, faiss.METRIC_INNER_PRODUCT)
+    elif index_type == "flat":
+        index = faiss.IndexFlatIP(dimension)
+    elif index_type == "hnsw":
+        if qtype is not None:
+            index = faiss.IndexHNSWSQ(dimension, qtype, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexHNSWFlat(dimension, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = hnsw_ef_construction
+        index.hnsw.efSearch = hnsw_ef_search
+    elif index_type == "ivfpq":
+        if dimension % ivfpq_m != 0:
+            raise ValueError(
+                f"ivfpq_m ({ivfpq_m}) must divide the embedding dimension ({dimension})"
+            )
+        # k-means wants about 39 training points per centroid
+        nlist = max(1, min(int(4 * np.sqrt(n_vectors)), n_vectors // 39))
+        index = faiss.IndexIVFPQ(
+            faiss.IndexFlatIP(dimension), dimension, nlist, ivfpq_m, 8,
+            faiss.METRIC_INNER_PRODUCT,
+        )
+        index.nprobe = ivfpq_nprobe
+    else:
+        raise ValueError(
+            f"Unsupported FAISS index type: {index_type}. "
+            f"Supported types: auto, flat, hnsw, ivfpq"
+        )
+    
+    return _fill_index(index, vectors, add_batch_size)
+
+
+def _fill_index(index: "faiss.Index", vectors: np.ndarray, add_batch_size: int) -> "faiss.Index":
+    """
+    Train an index if needed, then add the vectors in slices.
+    
+    The training sample holds at least TRAIN_SAMPLE_SIZE vectors and, for
+    IVF indexes, 256 per inverted list, the most FAISS k-means uses per
+    centroid. Larger corpora only add vectors, not training time.
+    
+    Args:
+        index: Empty FAISS index
+        vectors: L2-normalized float32 matrix of shape (N, d)
+        add_batch_size: Number of vectors added at a time
+        
+    Returns:
+        The index containing all vectors
+    """
+    import faiss
+    
+    n_vectors = vectors.shape[0]
+    
+    if not index.is_trained:
+        ivf = faiss.try_extract_index_ivf(index)
+        sample_size = max(TRAIN_SAMPLE_SIZE, 256 * ivf.nlist if ivf is not None else 0)
+        if n_vectors > sample_size:
+            # Sorted rows read a memory-mapped matrix sequentially
+            rows = np.sort(np.random.default_rng(0).choice(n_vectors, sample_size, replace=False))
+            index.train(vectors[rows])
+        else:
+            index.train(vectors)
+    
+    for start in range(0, n_vectors, add_batch_size):
+        index.add(vectors[start:start + add_batch_size])
+    
+    return index
+
+
+def _scalar_quantizer_type(quantize: Union[bool, str]) -> Optional[int]:
+    """
+    Map the quantize setting to a FAISS scalar quantizer type.
+    
+    Args:
+        quantize: "int8", "fp16" or "fp32", or a bool for "int8"/"fp32"
+        
+    Returns:
+        ScalarQuantizer type, or None to store float32 vectors
+    """
+    import faiss
+    
+    if quantize is True or quantize == "int8":
+        return faiss.ScalarQuantizer.QT_8bit
+    if quantize == "fp16":
+        return faiss.ScalarQuantizer.QT_fp16
+    if quantize is False or quantize is None or quantize == "fp32":
+        return None
+    raise ValueError(
+        f"Unsupported quantization: {quantize}. Supported values: fp32, fp16, int8"
+    )
+
+
 # Pinecone Implementation (Cloud Vector Store - Placeholder)
 
 def _get_pinecone_vectorstore(embeddings: Embeddings, **kwargs) -> VectorStore:
@@ -244,6 +875,35 @@ def _create_chroma_from_docs(
     raise NotImplementedError("Chroma integration not yet implemented")
 
 
+# Load and create functions per provider
+_LOAD_REGISTRY = {
+    "faiss": _get_faiss_vectorstore,
+    "flat": _get_flat_vectorstore,
+    "pinecone": _get_pinecone_vectorstore,
+    "weaviate": _get_weaviate_vectorstore,
+    "chroma": _get_chroma_vectorstore,
+}
+
+_CREATE_REGISTRY = {
+    "faiss": _create_faiss_from_docs,
+    "flat": _create_flat_from_docs,
+    "pinecone": _create_pinecone_from_docs,
+    "weaviate": _create_weaviate_from_docs,
+    "chroma": _create_chroma_from_docs,
+}
+
+
+def _provider_function(registry: Dict[str, Callable], provider: str) -> Callable:
+    """Look up the function of a provider (case-insensitive), rejecting unknown providers."""
+    try:
+        return registry[provider.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported vector store provider: {provider}. "
+            f"Supported providers: {', '.join(registry)}"
+        ) from None
+
+
 # TODO: NIS-2 specific vector store features
 # - create_nis2_index_with_metadata(): Create index with compliance metadata
 # - hybrid_search(): Combine vector and keyword search
@@ -0,0 +1 @@
+"""Tests for the NIS-2 Expert System."""
@@ -0,0 +1,167 @@
+"""Tests for response caching and retriever post-processing."""
+
+from types import SimpleNamespace
+
+import pytest
+from langchain.schema import Document
+
+from src.chains import response_cache
+from src.chains.response_cache import CachedChain, ResponseCache, chain_fingerprint
+from src.chains.retrievers import deduplicate_documents
+
+
+class FakeChain:
+    """Callable stand-in for a RetrievalQA chain."""
+
+    def __init__(self, temperature=0.0, template="Answer: {question}", k=4):
+        llm = SimpleNamespace(model_name="gpt-4", temperature=temperature, max_tokens=None)
+        prompt = SimpleNamespace(template=template)
+        self.combine_documents_chain = SimpleNamespace(
+            llm_chain=SimpleNamespace(llm=llm, prompt=prompt)
+        )
+        self.retriever = SimpleNamespace(search_kwargs={"k": k})
+        self.calls = 0
+
+    def __call__(self, inputs):
+        self.calls += 1
+        return {"query": inputs["query"], "result": f"answer {self.calls}"}
+
+
+class FakeClock:
+    """Replacement for time.time() that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(response_cache.time, "time", fake)
+    return fake
+
+
+def test_make_key_is_stable_and_order_sensitive():
+    """Keys depend on every component and their order."""
+    assert ResponseCache.make_key("a", "b") == ResponseCache.make_key("a", "b")
+    assert ResponseCache.make_key("a", "b") != ResponseCache.make_key("b", "a")
+
+
+def test_entries_expire_after_ttl(clock):
+    """Entries are returned until their TTL has passed."""
+    cache = ResponseCache(ttl=60)
+    cache.set("key", {"result": "x"})
+
+    clock.now += 59
+    assert cache.get("key") == {"result": "x"}
+
+    clock.now += 2
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_entries_without_ttl_never_expire(clock):
+    """Without a TTL entries stay cached."""
+    cache = ResponseCache()
+    cache.set("key", {"result": "x"})
+    clock.now += 10 ** 9
+    assert cache.get("key") == {"result": "x"}
+
+
+def test_fingerprint_changes_with_configuration():
+    """Model settings, prompt and retrieval settings are all fingerprinted."""
+    base = chain_fingerprint(FakeChain())
+
+    assert chain_fingerprint(FakeChain()) == base
+    assert chain_fingerprint(FakeChain(temperature=0.5)) != base
+    assert chain_fingerprint(FakeChain(template="Other: {question}")) != base
+    assert chain_fingerprint(FakeChain(k=8)) != base
+
+
+def test_cached_chain_answers_repeated_inputs_from_cache():
+    """The wrapped chain runs once per distinct input."""
+    chain = FakeChain()
+    cached = CachedChain(chain, ResponseCache())
+
+    first = cached({"query": "What is NIS-2?"})
+    second = cached({"query": "What is NIS-2?"})
+    cached({"query": "Who is affected?"})
+
+    assert first == second
+    assert chain.calls == 2
+
+
+def test_cached_chain_separates_configurations():
+    """Chains with different settings do not share cached answers."""
+    cache = ResponseCache()
+    CachedChain(FakeChain(k=4), cache)({"query": "q"})
+
+    other = FakeChain(k=8)
+    CachedChain(other, cache)({"query": "q"})
+    assert other.calls == 1
+
+
+def test_cached_chain_skips_sampling_chains():
+    """Chains with a temperature above zero are not cached."""
+    chain = FakeChain(temperature=0.7)
+    cached = CachedChain(chain, ResponseCache())
+
+    cached({"query": "q"})
+    cached({"query": "q"})
+    assert chain.calls == 2
+
+
+def test_cached_chain_recomputes_after_ttl(clock):
+    """Expired answers are recomputed."""
+    chain = FakeChain()
+    cached = CachedChain(chain, ResponseCache(ttl=60))
+
+    cached({"query": "q"})
+    clock.now += 61
+    assert cached({"query": "q"})["result"] == "answer 2"
+
+
+def words(n, start=0):
+    return " ".join(f"w{i}" for i in range(start, start + n))
+
+
+def test_deduplicate_drops_near_duplicates():
+    """A lower-ranked document overlapping a kept one is dropped."""
+    best = Document(page_content=words(40))
+    overlap = Document(page_content=words(40, start=2))
+    distinct = Document(page_content=words(40, start=100))
+
+    kept = deduplicate_documents([best, overlap, distinct], threshold=0.7)
+    assert kept == [best, distinct]
+
+
+def test_deduplicate_is_case_insensitive_and_keeps_order():
+    """Shingles ignore case; kept documents keep their ranking."""
+    first = Document(page_content="Essential entities must report incidents within 24 hours")
+    upper = Document(page_content=first.page_content.upper())
+    other = Document(page_content="Member states designate competent authorities for oversight")
+
+    assert deduplicate_documents([first, upper, other]) == [first, other]
+
+
+def test_deduplicate_threshold_is_inclusive():
+    """Documents at exactly the threshold are dropped."""
+    # 6 words give 2 shingles; one shared shingle out of 3 is similarity 1/3
+    a = Document(page_content="a b c d e f")
+    b = Document(page_content="b c d e f g")
+
+    assert deduplicate_documents([a, b], threshold=1 / 3) == [a]
+    assert deduplicate_documents([a, b], threshold=0.34) == [a, b]
+
+
+def test_deduplicate_short_documents():
+    """Texts shorter than a shingle are compared as a whole."""
+    a = Document(page_content="NIS-2 scope")
+    b = Document(page_content="nis-2   scope")
+    c = Document(page_content="")
+    d = Document(page_content=" ")
+
+    assert deduplicate_documents([a, b, c, d]) == [a, c]
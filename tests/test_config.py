@@ -0,0 +1,88 @@
+"""Tests for configuration loading and environment overrides."""
+
+import os
+
+import pytest
+
+from src.config import load_config
+from src.config.config_loader import _apply_env_overrides
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    """Remove NIS2_ variables of the surrounding environment."""
+    for key in list(os.environ):
+        if key.startswith("NIS2_"):
+            monkeypatch.delenv(key)
+
+
+def make_config():
+    return {
+        "embeddings": {"provider": "openai", "model": "3.10", "dimensions": 1536},
+        "retrieval": {"k": 4, "threshold": 0.5, "rerank": True, "tags": ["a"]},
+    }
+
+
+def test_int_override_is_coerced(monkeypatch):
+    """Overrides of int settings become ints."""
+    monkeypatch.setenv("NIS2_RETRIEVAL_K", "8")
+    config = make_config()
+    _apply_env_overrides(config)
+    assert config["retrieval"]["k"] == 8
+    assert isinstance(config["retrieval"]["k"], int)
+
+
+def test_float_and_bool_overrides_are_coerced(monkeypatch):
+    """Overrides of float and bool settings take the type of the setting."""
+    monkeypatch.setenv("NIS2_RETRIEVAL_THRESHOLD", "1")
+    monkeypatch.setenv("NIS2_RETRIEVAL_RERANK", "off")
+    config = make_config()
+    _apply_env_overrides(config)
+    assert config["retrieval"]["threshold"] == 1.0
+    assert isinstance(config["retrieval"]["threshold"], float)
+    assert config["retrieval"]["rerank"] is False
+
+
+def test_list_override_is_parsed(monkeypatch):
+    """Overrides of list settings are read as YAML flow sequences."""
+    monkeypatch.setenv("NIS2_RETRIEVAL_TAGS", "[b, c]")
+    config = make_config()
+    _apply_env_overrides(config)
+    assert config["retrieval"]["tags"] == ["b", "c"]
+
+
+@pytest.mark.parametrize("value", ["3.10", "off", "yes", "1e5", "0x1f"])
+def test_string_override_keeps_raw_value(monkeypatch, value):
+    """Overrides of string settings are never converted."""
+    monkeypatch.setenv("NIS2_EMBEDDINGS_MODEL", value)
+    config = make_config()
+    _apply_env_overrides(config)
+    assert config["embeddings"]["model"] == value
+
+
+def test_new_key_keeps_raw_value(monkeypatch):
+    """Keys missing from the configuration are set as strings."""
+    monkeypatch.setenv("NIS2_EMBEDDINGS_DEVICE", "1")
+    config = make_config()
+    _apply_env_overrides(config)
+    assert config["embeddings"]["device"] == "1"
+
+
+def test_unconvertible_override_raises(monkeypatch):
+    """Values that do not fit the type of the setting are rejected."""
+    monkeypatch.setenv("NIS2_EMBEDDINGS_DIMENSIONS", "many")
+    config = make_config()
+    with pytest.raises(ValueError, match="NIS2_EMBEDDINGS_DIMENSIONS"):
+        _apply_env_overrides(config)
+
+
+def test_load_config_applies_overrides(monkeypatch, tmp_path):
+    """load_config() applies overrides without changing the cached parse."""
+    path = tmp_path / "config.yaml"
+    path.write_text("retrieval:\n  k: 4\n", encoding="utf-8")
+
+    monkeypatch.setenv("NIS2_RETRIEVAL_K", "8")
+    assert load_config(str(path)).get("retrieval.k") == 8
+
+    monkeypatch.delenv("NIS2_RETRIEVAL_K")
+    assert load_config(str(path)).get("retrieval.k") == 4
@@ -0,0 +1,55 @@
+"""Tests for document splitting."""
+
+from langchain.schema import Document
+
+from src.splitters.text_splitter import _split_document, get_text_splitter, split_documents
+
+
+def make_splitter():
+    return get_text_splitter(chunk_size=50, chunk_overlap=0, length_unit="characters")
+
+
+def test_short_document_matches_splitter_output():
+    """The fast path returns the chunk the recursive splitter would."""
+    splitter = make_splitter()
+    document = Document(page_content="  Article 21\nRisk management.  \n", metadata={"page": 3})
+
+    chunks = _split_document(splitter, document)
+
+    expected = splitter.split_documents([document])
+    assert [c.page_content for c in chunks] == [c.page_content for c in expected]
+    assert [c.metadata for c in chunks] == [c.metadata for c in expected]
+
+
+def test_short_document_metadata_is_copied():
+    """Chunks do not share the metadata dict of the source document."""
+    document = Document(page_content="short", metadata={"page": 1})
+    chunk = _split_document(make_splitter(), document)[0]
+
+    chunk.metadata["parent_id"] = "x"
+    assert document.metadata == {"page": 1}
+
+
+def test_blank_document_has_no_chunks():
+    """Whitespace-only documents produce no chunks, like the splitter."""
+    assert _split_document(make_splitter(), Document(page_content=" \n\n ")) == []
+
+
+def test_long_document_uses_recursive_splitter():
+    """Documents longer than a chunk are split as before."""
+    splitter = make_splitter()
+    text = "\n\n".join(f"Paragraph {i} about incident reporting duties." for i in range(6))
+    document = Document(page_content=text, metadata={"source": "nis2.pdf"})
+
+    chunks = _split_document(splitter, document)
+
+    expected = splitter.split_documents([document])
+    assert len(chunks) > 1
+    assert [c.page_content for c in chunks] == [c.page_content for c in expected]
+
+
+def test_split_documents_keeps_input_order():
+    """Chunks of several documents are returned in input order."""
+    documents = [Document(page_content=f"doc {i}") for i in range(5)]
+    chunks = split_documents(documents, chunk_size=50, chunk_overlap=0, max_workers=1)
+    assert [c.page_content for c in chunks] == [f"doc {i}" for i in range(5)]
@@ -0,0 +1,85 @@
+"""Tests for int8 quantization and the flat vector store."""
+
+import numpy as np
+import pytest
+from langchain.embeddings import FakeEmbeddings
+
+from src.vectorstore import flat_store
+from src.vectorstore.flat_store import FlatVectorStore
+from src.vectorstore.quantize import quantize_int8
+
+
+def random_vectors(n, d, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, d)).astype(np.float32)
+
+
+def test_quantize_int8_maps_largest_component_to_127():
+    """Each vector gets its own scale and its largest component becomes +/-127."""
+    vectors = np.array([[0.5, -1.0, 0.25], [10.0, 2.0, -5.0]], dtype=np.float32)
+    codes, scales = quantize_int8(vectors)
+
+    assert codes.dtype == np.int8
+    assert scales.dtype == np.float32
+    assert np.abs(codes).max(axis=1).tolist() == [127, 127]
+    np.testing.assert_allclose(scales, [1.0 / 127, 10.0 / 127], rtol=1e-6)
+
+
+def test_quantize_int8_round_trip_error_is_bounded():
+    """Dequantized values are within half a quantization step."""
+    vectors = random_vectors(50, 16)
+    codes, scales = quantize_int8(vectors)
+    restored = codes.astype(np.float32) * scales[:, np.newaxis]
+    assert np.all(np.abs(restored - vectors) <= scales[:, np.newaxis] / 2 + 1e-6)
+
+
+def test_quantize_int8_handles_zero_and_single_vectors():
+    """Zero vectors quantize to zero codes; 1-D input becomes one row."""
+    codes, scales = quantize_int8(np.zeros(4))
+    assert codes.shape == (1, 4)
+    assert not codes.any()
+    assert scales.tolist() == [1.0]
+
+
+@pytest.fixture
+def int8_store(monkeypatch):
+    """Quantized store scored on the numpy path, a few rows per block."""
+    monkeypatch.setattr(flat_store, "simsimd", None)
+    monkeypatch.setattr(flat_store, "SCORE_BLOCK_ROWS", 7)
+
+    store = FlatVectorStore(FakeEmbeddings(size=16), quant_threshold_bytes=0)
+    vectors = random_vectors(30, 16)
+    store.add_embeddings([f"doc {i}" for i in range(30)], vectors.tolist())
+    return store, vectors
+
+
+def test_store_switches_to_int8_above_threshold(int8_store):
+    """Storage becomes int8 codes with one scale per row."""
+    store, _ = int8_store
+    assert store.matrix.dtype == np.int8
+    assert store.scales.shape == (30,)
+
+
+def test_int8_block_scoring_matches_float_cosine(int8_store):
+    """Block-wise int8 scores approximate the exact cosine similarities."""
+    store, vectors = int8_store
+    query = random_vectors(1, 16, seed=1)[0]
+
+    scores = store._cosine_similarity(query)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = normalized @ (query / np.linalg.norm(query))
+    assert scores.shape == (30,)
+    np.testing.assert_allclose(scores, expected, atol=0.02)
+
+
+def test_int8_search_returns_nearest_document(int8_store):
+    """A stored vector is its own best match."""
+    store, vectors = int8_store
+    results = store.similarity_search_by_vector_with_score(vectors[12].tolist(), k=3)
+
+    assert len(results) == 3
+    assert results[0][0].page_content == "doc 12"
+    assert results[0][1] == pytest.approx(1.0, abs=0.01)
+    assert [score for _, score in results] == sorted(
+        (score for _, score in results), reverse=True
+    )
@@ -4,82 +4,183 @@ Validation script to verify the project structure.
 This script checks that all files and directories are in place.
 """
 
+import ast
 import os
 from pathlib import Path
+from typing import List, Optional, Set, Tuple
 
+# Directories never searched for Python files
+SKIP_DIRS = frozenset({
+    ".git", "__pycache__", ".venv", "venv", "node_modules", ".mypy_cache", ".pytest_cache",
+})
 
-def check_structure():
-    """Check that all required files and directories exist."""
+# Directories and files that must exist, relative to the project root.
+# Tuples keep the report in this order.
+REQUIRED_DIRS = (
+    "src",
+    "src/config",
+    "src/loaders",
+    "src/splitters",
+    "src/embeddings",
+    "src/vectorstore",
+    "src/chains",
+    "src/utils",
+    "data",
+    "data/documents",
+    "data/vectorstore",
+    "data/reports",
+    "data/audit_logs",
+    "logs",
+)
+
+REQUIRED_FILES = (
+    "config.yaml",
+    "main.py",
+    "setup.py",
+    "requirements.txt",
+    ".gitignore",
+    ".env.example",
+    "README.md",
+    "src/__init__.py",
+    "src/config/__init__.py",
+    "src/config/config_loader.py",
+    "src/loaders/__init__.py",
+    "src/loaders/document_loader.py",
+    "src/splitters/__init__.py",
+    "src/splitters/text_splitter.py",
+    "src/embeddings/__init__.py",
+    "src/embeddings/embedding_factory.py",
+    "src/embeddings/batched_embeddings.py",
+    "src/embeddings/embedding_cache.py",
+    "src/embeddings/infinity_embeddings.py",
+    "src/embeddings/ollama_embeddings.py",
+    "src/embeddings/onnx_embeddings.py",
+    "src/vectorstore/__init__.py",
+    "src/vectorstore/vectorstore_factory.py",
+    "src/vectorstore/flat_store.py",
+    "src/vectorstore/quantize.py",
+    "src/vectorstore/_kernels.py",
+    "src/chains/__init__.py",
+    "src/chains/retrieval_chain.py",
+    "src/chains/response_cache.py",
+    "src/chains/retrievers.py",
+    "src/chains/streaming.py",
+    "src/utils/__init__.py",
+    "src/utils/helpers.py",
+)
+
+
+def scan_project(root: Path) -> Tuple[Set[str], Set[str]]:
+    """
+    List the directories and files of the project in a single walk.
     
-    base_path = Path(__file__).parent
+    Skipped directories are pruned during the walk, so version control
+    objects and virtual environments inside the project are never listed.
+    The same listing answers the existence checks and provides the files
+    for the syntax check, so the tree is traversed only once.
     
-    # Required directories
-    required_dirs = [
-        "src",
-        "src/config",
-        "src/loaders",
-        "src/splitters",
-        "src/embeddings",
-        "src/vectorstore",
-        "src/chains",
-        "src/utils",
-        "data",
-        "data/documents",
-        "data/vectorstore",
-        "data/reports",
-        "data/audit_logs",
-        "logs",
-    ]
-    
-    # Required files
-    required_files = [
-        "config.yaml",
-        "main.py",
-        "setup.py",
-        "requirements.txt",
-        ".gitignore",
-        ".env.example",
-        "README.md",
-        "src/__init__.py",
-        "src/config/__init__.py",
-        "src/config/config_loader.py",
-        "src/loaders/__init__.py",
-        "src/loaders/document_loader.py",
-        "src/splitters/__init__.py",
-        "src/splitters/text_splitter.py",
-        "src/embeddings/__init__.py",
-        "src/embeddings/embedding_factory.py",
-        "src/vectorstore/__init__.py",
-        "src/vectorstore/vectorstore_factory.py",
-        "src/chains/__init__.py",
-        "src/chains/retrieval_chain.py",
-        "src/utils/__init__.py",
-        "src/utils/helpers.py",
-    ]
+    Args:
+        root: Project root directory
+        
+    Returns:
+        Relative POSIX paths of all directories and of all files
+    """
+    directories = set()
+    files = set()
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = [name for name in dir_names if name not in SKIP_DIRS]
+        relative = Path(dir_path).relative_to(root).as_posix()
+        prefix = "" if relative == "." else f"{relative}/"
+        directories.update(prefix + name for name in dir_names)
+        files.update(prefix + name for name in file_names)
+    return directories, files
+
+
+def validate_python_syntax(path: Path) -> Optional[str]:
+    """
+    Check that a Python file compiles.
     
-    print("Checking project structure...\n")
+    The raw bytes are compiled to an AST only, so no bytecode is generated
+    and the source encoding (BOM or coding declaration) is handled by
+    compile() itself.
     
-    all_ok = True
+    Args:
+        path: Python file to check
+        
+    Returns:
+        None if the file has valid syntax, the error message otherwise
+    """
+    try:
+        compile(path.read_bytes(), str(path), "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+    except (SyntaxError, ValueError) as e:
+        return str(e)
+    return None
+
+
+def check_paths(
+    title: str, required: Tuple[str, ...], present: Set[str], quiet: bool
+) -> Tuple[List[str], bool]:
+    """
+    Build the report section for a group of required paths.
     
-    # Check directories
-    print("Directories:")
-    for dir_path in required_dirs:
-        full_path = base_path / dir_path
-        if full_path.exists() and full_path.is_dir():
-            print(f"  ✓ {dir_path}")
+    Args:
+        title: Section title
+        required: Required relative paths
+        present: Relative paths found in the project
+        quiet: Whether to omit paths that exist
+        
+    Returns:
+        Report lines and whether all paths exist
+    """
+    lines = [f"{title}:"]
+    all_ok = True
+    for path in required:
+        if path in present:
+            if not quiet:
+                lines.append(f"  ✓ {path}")
         else:
-            print(f"  ✗ {dir_path} - MISSING")
+            lines.append(f"  ✗ {path} - MISSING")
             all_ok = False
+    if quiet and all_ok:
+        lines.append(f"  ✓ all {len(required)} present")
+    return lines, all_ok
+
+
+def check_structure(quiet: bool = False):
+    """
+    Check that all required files and directories exist.
     
-    print("\nFiles:")
-    # Check files
-    for file_path in required_files:
-        full_path = base_path / file_path
-        if full_path.exists() and full_path.is_file():
-            print(f"  ✓ {file_path}")
-        else:
-            print(f"  ✗ {file_path} - MISSING")
-            all_ok = False
+    Each section of the report is written with a single print call instead
+    of one per path.
+    
+    Args:
+        quiet: Whether to list only missing paths and syntax errors
+    """
+    
+    base_path = Path(__file__).parent
+    
+    print("Checking project structure...\n")
+    
+    directories, files = scan_project(base_path)
+    
+    lines, dirs_ok = check_paths("Directories", REQUIRED_DIRS, directories, quiet)
+    print("\n".join(lines))
+    
+    lines, files_ok = check_paths("Files", REQUIRED_FILES, files, quiet)
+    print("\n" + "\n".join(lines))
+    
+    lines = ["Syntax:"]
+    python_files = sorted(path for path in files if path.endswith(".py"))
+    for path in python_files:
+        error = validate_python_syntax(base_path / path)
+        if error is not None:
+            lines.append(f"  ✗ {path} - SYNTAX ERROR: {error}")
+    syntax_ok = len(lines) == 1
+    if syntax_ok:
+        lines.append(f"  ✓ {len(python_files)} Python files compile")
+    print("\n" + "\n".join(lines))
+    
+    all_ok = dirs_ok and files_ok and syntax_ok
     
     print("\n" + "="*70)
     if all_ok:
@@ -99,4 +200,4 @@ def check_structure():
 
 if __name__ == "__main__":
     import sys
-    sys.exit(check_structure())
+    sys.exit(check_structure(quiet="--quiet" in sys.argv[1:]))